@@ -0,0 +1,239 @@
+import os
+import re
+import time
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, unquote, urlparse
+from bs4 import BeautifulSoup
+from state_store import load_state, save_state
+
+# ===[첨부파일 보관소 설정]===
+# 새 공지의 첨부(PDF/HWP 등)를 내용 해시(sha256) 이름으로 저장 → 같은 파일은 한 번만 보관
+# ATTACHMENT_MIRROR=1 일 때만 동작 (선택 단계)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ENABLED = os.environ.get("ATTACHMENT_MIRROR", "") == "1"
+MIRROR_DIR = os.environ.get("ATTACHMENT_DIR") or os.path.join(BASE_DIR, "..", "data", "attachments")
+INDEX_FILE = os.path.join(MIRROR_DIR, "index.json")
+INDEX_MD = os.path.join(MIRROR_DIR, "index.md")
+
+MAX_FILE_BYTES = int(os.environ.get("ATTACHMENT_MAX_BYTES", 30 * 1024 * 1024))     # 파일 1개 한도
+MAX_TOTAL_BYTES = int(os.environ.get("ATTACHMENT_TOTAL_BYTES", 200 * 1024 * 1024)) # 실행 1회 한도
+TIME_BUDGET = float(os.environ.get("ATTACHMENT_TIME_BUDGET", 120))                 # 실행 1회 시간(초)
+WORKERS = int(os.environ.get("ATTACHMENT_WORKERS", 4))
+
+ATTACH_EXTS = (".pdf", ".hwp", ".hwpx", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".zip", ".jpg", ".png")
+DOWNLOAD_PATTERN = re.compile(r'download|fileDown|attachNo|file_down', re.IGNORECASE)
+
+
+# ===[첨부 링크 추출]===
+def find_attachment_links(html, page_url):
+    """상세 페이지에서 첨부파일 링크(절대 URL) 목록 추출"""
+    soup = BeautifulSoup(html, 'html.parser')
+    links = []
+    for a_tag in soup.select('a[href]'):
+        href = a_tag.get('href').strip()
+        if href.startswith(("javascript", "#", "mailto:")):
+            continue
+        path = urlparse(href).path.lower()
+        if not (DOWNLOAD_PATTERN.search(href) or path.endswith(ATTACH_EXTS)):
+            continue
+        url = urljoin(page_url, href)
+        if url not in links:
+            links.append(url)
+    return links
+
+
+def _filename(response, url):
+    """Content-Disposition 또는 URL에서 원본 파일명 추출"""
+    disposition = response.headers.get("Content-Disposition", "")
+    match = re.search(r"filename\*=(?:UTF-8'')?([^;]+)", disposition, re.IGNORECASE) \
+        or re.search(r'filename="?([^";]+)"?', disposition, re.IGNORECASE)
+    if match:
+        name = unquote(match.group(1).strip())
+        try:
+            # 일부 서버는 UTF-8 파일명을 latin-1로 내려줌
+            name = name.encode("latin-1").decode("utf-8")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            pass
+        return os.path.basename(name)
+    return os.path.basename(unquote(urlparse(url).path)) or "attachment"
+
+
+def object_path(digest, ext=""):
+    """해시 → 저장 경로 (objects/ab/abcdef....pdf)"""
+    return os.path.join(MIRROR_DIR, "objects", digest[:2], digest + ext)
+
+
+# ===[보관소]===
+class _Mirror:
+    """1회 실행 동안의 예산/중복 관리"""
+
+    def __init__(self, session_factory, request_kwargs, time_limit=None):
+        self.session_factory = session_factory
+        self.request_kwargs = request_kwargs
+        self.index = load_state(INDEX_FILE)
+        self.index.setdefault("urls", {})
+        self.index.setdefault("files", {})
+        # 봇의 실행 시간 예산이 더 짧으면 그 안에서만
+        self.deadline = time.monotonic() + (TIME_BUDGET if time_limit is None else min(TIME_BUDGET, time_limit))
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.in_flight = {}     # 받는 중인 URL → 함께 연결할 공지들
+        self.local = threading.local()
+        self.stats = {"fetched": 0, "reused": 0, "deduped": 0, "skipped": 0}
+
+    def _session(self):
+        # 세션은 스레드마다 따로 사용
+        if not hasattr(self.local, "session"):
+            self.local.session = self.session_factory()
+        return self.local.session
+
+    def _timeout(self):
+        return max(1.0, min(30.0, self.deadline - time.monotonic()))
+
+    def _link(self, digest, ref):
+        entry = self.index["files"][digest]
+        if ref not in entry["notices"]:
+            entry["notices"].append(ref)
+
+    def _claim(self, url, ref):
+        """이미 받은 URL이면 기록만 연결하고 False (다시 받지 않음)"""
+        with self.lock:
+            digest = self.index["urls"].get(url)
+            if digest:
+                self._link(digest, ref)
+                self.stats["reused"] += 1
+                return False
+            if url in self.in_flight:
+                self.in_flight[url].append(ref)
+                self.stats["reused"] += 1
+                return False
+            self.in_flight[url] = [ref]
+            return True
+
+    def _reserve(self, size):
+        with self.lock:
+            if self.total_bytes + size > MAX_TOTAL_BYTES:
+                return False
+            self.total_bytes += size
+            return True
+
+    def download(self, url, ref):
+        if time.monotonic() >= self.deadline or not self._claim(url, ref):
+            return
+        tmp_path = None
+        try:
+            response = self._session().get(url, timeout=self._timeout(), stream=True, **self.request_kwargs)
+            try:
+                response.raise_for_status()
+                length = int(response.headers.get("Content-Length") or 0)
+                if length > MAX_FILE_BYTES or (length and not self._reserve(length)):
+                    print(f"  ⚠ [첨부] 용량 한도 초과로 건너뜀: {url}")
+                    self.stats["skipped"] += 1
+                    return
+                name = _filename(response, url)
+                ext = os.path.splitext(name)[1].lower()[:10]
+                sha = hashlib.sha256()
+                size = 0
+                os.makedirs(os.path.join(MIRROR_DIR, "objects"), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.join(MIRROR_DIR, "objects"))
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if not chunk:
+                            continue
+                        size += len(chunk)
+                        if size > MAX_FILE_BYTES or time.monotonic() >= self.deadline:
+                            raise TimeoutError("용량/시간 한도 초과")
+                        if not length and not self._reserve(len(chunk)):
+                            raise TimeoutError("전체 용량 한도 초과")
+                        sha.update(chunk)
+                        f.write(chunk)
+            finally:
+                response.close()
+
+            digest = sha.hexdigest()
+            with self.lock:
+                path = object_path(digest, ext)
+                if digest in self.index["files"]:
+                    # 다른 URL로 올라온 같은 파일 → 저장하지 않고 연결만
+                    os.remove(tmp_path)
+                    self.stats["deduped"] += 1
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(tmp_path, path)
+                    self.index["files"][digest] = {
+                        "name": name, "size": size,
+                        "path": os.path.relpath(path, MIRROR_DIR), "notices": []
+                    }
+                    self.stats["fetched"] += 1
+                tmp_path = None
+                self.index["urls"][url] = digest
+                for waiting_ref in self.in_flight.get(url, [ref]):
+                    self._link(digest, waiting_ref)
+        except Exception as e:
+            print(f"  ⚠ [첨부] 다운로드 실패: {url} ({e})")
+            self.stats["skipped"] += 1
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            with self.lock:
+                self.in_flight.pop(url, None)
+
+    def mirror_notice(self, board_key, notice, downloads):
+        """상세 페이지에서 첨부 링크를 찾아 다운로드 작업 등록"""
+        if time.monotonic() >= self.deadline:
+            return
+        ref = {"board": board_key, "id": notice["id"], "title": notice["title"], "link": notice["link"]}
+        try:
+            response = self._session().get(notice["link"], timeout=self._timeout(), **self.request_kwargs)
+            response.encoding = 'utf-8'
+            links = find_attachment_links(response.text, notice["link"])
+        except Exception as e:
+            print(f"  ⚠ [첨부] 상세 페이지 접속 실패: {notice['link']} ({e})")
+            return
+        for url in links:
+            downloads.append((url, ref))
+
+
+def write_index_md(index):
+    """사람이 보는 목록 (공지 → 보관된 파일 링크)"""
+    by_notice = {}
+    for digest, entry in index.get("files", {}).items():
+        for ref in entry["notices"]:
+            key = (ref["board"], ref["id"])
+            by_notice.setdefault(key, (ref, []))[1].append(entry)
+    lines = ["# 첨부파일 보관소\n"]
+    for key in sorted(by_notice, key=lambda k: (k[0], str(k[1])), reverse=True):
+        ref, entries = by_notice[key]
+        lines.append(f"- [{ref['board']}] [{ref['title']}]({ref['link']})")
+        for entry in entries:
+            lines.append(f"  - [{entry['name']}]({entry['path']}) ({entry['size'] // 1024}KB)")
+    with open(INDEX_MD, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+# ===[외부 진입점]===
+def mirror_attachments(board_key, notices, session_factory, request_kwargs=None, time_limit=None):
+    """새 공지들의 첨부를 예산 안에서 병렬로 보관 (ATTACHMENT_MIRROR=1 일 때만, time_limit: 남은 실행 시간(초))"""
+    if not ENABLED or not notices:
+        return None
+    if time_limit is not None and time_limit <= 1:
+        print("  ⏭ [첨부 보관] 실행 시간이 모자라 건너뜀")
+        return None
+    try:
+        mirror = _Mirror(session_factory, request_kwargs or {}, time_limit)
+        downloads = []
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            list(pool.map(lambda n: mirror.mirror_notice(board_key, n, downloads), notices))
+            list(pool.map(lambda d: mirror.download(*d), downloads))
+
+        write_index_md(save_state(INDEX_FILE, mirror.index))
+    except Exception as e:
+        # 보관은 부가 기능 → 실패해도 알림/상태 저장은 계속
+        print(f"  ⚠ [첨부 보관] 실패: {e}")
+        return None
+    s = mirror.stats
+    print(f"  📎 [첨부 보관] 새로 저장 {s['fetched']} / 기존 재사용 {s['reused']} / 중복 {s['deduped']} / 건너뜀 {s['skipped']}")
+    return mirror.stats
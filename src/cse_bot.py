@@ -1,15 +1,19 @@
-from curl_cffi import requests
-from bs4 import BeautifulSoup
 import os
 import time
-import json
 import re
 import urllib3
 import traceback
 import random
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from collections import Counter
 from dotenv import load_dotenv
+from discord_render import build_notice_payloads
+from list_stream import iter_rows
+from profiler import run_profiled
+from outbox import start_delivery, finish_delivery
+from run_budget import RunBudget
+from notice_core import Notice, NoticePipeline
+import http_client
+from http_client import get_client
 
 load_dotenv()
 
@@ -24,7 +28,8 @@ TARGET_BOARDS = [
     {
         "id": "bachelor", 
         "name": "학사공지", 
-        "url": "https://computer.cnu.ac.kr/computer/notice/bachelor.do?articleLimit=30"
+        "url": "https://computer.cnu.ac.kr/computer/notice/bachelor.do?articleLimit=30",
+        "priority": 0   # 실행 시간이 모자라도 먼저 확인 (기본값 1, 낮을수록 먼저)
     },
     {
         "id": "general", 
@@ -43,6 +48,9 @@ TARGET_BOARDS = [
     }
 ]
 
+# 셀렉터 감시: (적중, 분모) - 줄 → 제목 링크 → 글 ID
+CANARY_RATIOS = [("anchors", "rows"), ("ids", "anchors")]
+
 # 헤더 정보
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -58,9 +66,8 @@ HEADERS = {
 
 # ===[세션 생성기]===
 def get_session():
-    """Retry 가능한 세션 생성"""
-    session = requests.Session()
-    return session
+    """공용 HTTP 클라이언트 (연결/DNS/TLS 세션 재사용, impersonate 는 http_client 의 호스트 설정)"""
+    return get_client()
 
 
 # ===[ID 추출기]===
@@ -73,27 +80,10 @@ def extract_article_id(link):
 
 
 # ===[디코 전송기]===
-def send_discord_batch_alert(category_name, new_notices):
-    """디스코드 전송"""
-    if not new_notices:
-        return
-
-    if not DISCORD_WEBHOOK_URL:
-        print("⚠ 웹후크 URL이 없음")
-        return
-    
-    count = len(new_notices)
-    message_content = f"### 📢 [{category_name}] 새 글 {count}건\n\n"
-    
-    for notice in new_notices:
-        icon = "▶" if notice['is_top'] else "▷"
-        message_content += f"{icon} [{notice['title']}](<{notice['link']}>)\n"
-
-    try:
-        requests.post(DISCORD_WEBHOOK_URL, json={"content": message_content}, timeout=5)
-        print(f"✉ [전송 완료] {category_name} - {count}건")
-    except Exception as e:
-        print(f"⚠ [전송 실패] {e}")
+def render_batch_alert(category_name, new_notices):
+    """전송할 payload 리스트 생성 (2000자/embed 한도 자동 분할)"""
+    header = f"### 📢 [{category_name}] 새 글 {len(new_notices)}건\n\n"
+    return build_notice_payloads(header, new_notices)
 
 
 # ===[관리자 알림]===
@@ -114,93 +104,69 @@ def send_simple_error_log(error_msg=None):
         content = f"🚨 **[CSE 공지봇 치명적 오류]** \n{now}"
     
     try:
-        requests.post(MONITOR_WEBHOOK_URL, json={"content": content}, timeout=5)
+        http_client.post(MONITOR_WEBHOOK_URL, json={"content": content}, timeout=5)
         print("✉ [관리자 알림 전송 완료]")
     except:
         print("⚠ 관리자 알림 전송 실패")
 
 
-# ===[게시판 검사]===
-def check_board(session, board_info, saved_data):
-    """개별 게시판 확인 및 새 글 감지"""
-    board_id = board_info["id"]
-    board_name = board_info["name"]
+# ===[게시글 줄 파싱]===
+def parse_board_row(row, url, hits=None):
+    """목록의 tr 한 줄 → Notice (제목/링크/ID 없으면 None), hits에 셀렉터 적중 수 기록"""
+    hits = hits if hits is not None else Counter()
+    hits["rows"] += 1
+    title_div = row.select_one('.b-title-box > a')
+    if not title_div:
+        return None
+    hits["anchors"] += 1
+
+    title = title_div.get('title') or title_div.text.strip()
+    title = title.replace("자세히 보기", "").strip()
+    
+    href = title_div.get('href')
+    
+    if href.startswith('?'):
+        base_url = url.split('?')[0]
+        link = f"{base_url}{href}"
+    else:
+        link = href
+    
+    article_id = extract_article_id(link)
+    if article_id == 0:
+        return None
+    hits["ids"] += 1
+
+    row_classes = row.get('class', [])
+    is_top = 'b-top-box' in row_classes
+
+    return Notice(article_id, title, link, is_top)
+
+
+# ===[게시판 읽기]===
+def scan_board(session, board_info, budget):
+    """게시판 1개 접속 → (공지 iterator, 셀렉터 적중 수) - 공지는 읽히는 대로 하나씩 파싱"""
     url = board_info["url"]
+    print(f"● [{board_info['name']}] 분석 중...")
+    budget.sleep(random.uniform(3, 6))
 
-    print(f"● [{board_name}] 분석 중...")
+    # 진짜 크롬 브라우저인 척(TLS Fingerprint 위장) 접속 - impersonate="chrome120" 은 호스트 설정에서
+    # stream=True: 본문을 조금씩 읽다가 기준 ID에 닿으면 중단
+    response = session.get(url, headers=HEADERS, timeout=budget.timeout(30), stream=True)
+    hits = Counter()
 
-    try:
-        sleep_time = random.uniform(3, 6) 
-        time.sleep(sleep_time)
-        
-        # verify=False 대신 impersonate="chrome120" 사용
-        # 진짜 크롬 브라우저인 척(TLS Fingerprint 위장) 접속
-        response = session.get(url, headers=HEADERS, timeout=30, impersonate="chrome120")
-        
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
-        rows = soup.select('table.board-table tbody tr')
-        
-        if not rows:
-            print(f"⚠ [{board_name}] 게시글을 찾을 수 없음 (HTML 구조 변경 가능성)")
-            return False
-        
-        last_id = saved_data.get(board_id, 0)
-        new_notices = []
-        max_id = last_id
-
-        for row in rows:
-            title_div = row.select_one('.b-title-box > a')
-            if not title_div:
-                continue 
-
-            title = title_div.get('title') or title_div.text.strip()
-            title = title.replace("자세히 보기", "").strip()
-            
-            href = title_div.get('href')
-            
-            if href.startswith('?'):
-                base_url = url.split('?')[0]
-                link = f"{base_url}{href}"
-            else:
-                link = href
-            
-            article_id = extract_article_id(link)
-            if article_id == 0:
-                continue
-
-            row_classes = row.get('class', [])
-            is_top = 'b-top-box' in row_classes
-
-            if article_id > last_id:
-                new_notices.append({
-                    "id": article_id,
-                    "title": title,
-                    "link": link,
-                    "is_top": is_top
-                })
-                if article_id > max_id:
-                    max_id = article_id
-
-        # 최초 실행 처리
-        if last_id == 0 and max_id > 0:
-            print(f"☐ [{board_name}] 최초 실행 - 기준점(ID: {max_id})만 설정, 전송 X")
-            saved_data[board_id] = max_id
-            return True
-        
-        # 새 글이 있으면 처리
-        if new_notices:
-            new_notices.sort(key=lambda x: x['id'])
-            send_discord_batch_alert(board_name, new_notices)
-            saved_data[board_id] = max_id
-            return True
-        
-        return False
+    def notices():
+        stats = {}
+        try:
+            for row in iter_rows(response, table_class="board-table", stats=stats):
+                notice = parse_board_row(row, url, hits)
+                if notice:
+                    yield notice
+        except GeneratorExit:
+            # 고정글 이후는 최신순 → 기준 ID에 닿으면 나머지는 읽지 않음
+            print(f"  ⏹ 기준 ID 도달 - {stats['rows']}줄/{stats['bytes'] // 1024}KB 만 읽고 중단")
+            raise
 
-    except Exception as e:
-        print(f"⚠ [{board_name}] 에러: {e}")
-        send_simple_error_log(f"[{board_name}] 접속 실패\n{str(e)}")
-        return False
+    return notices(), hits
 
 
 # ===[MAIN]===
@@ -212,38 +178,35 @@ def run_bot():
     # SSL 경고 무시
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-    try:
-        saved_data = {}
+    # 실행 전체 시간 예산 (모자라면 우선순위 낮은 게시판은 다음 실행으로)
+    budget = RunBudget("cse")
 
-        # 파일 읽기
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                try:
-                    saved_data = json.load(f)
-                except:
-                    saved_data = {}
+    try:
+        # 지난 실행에서 못 보낸 알림은 수집하는 동안 백그라운드로 전송
+        start_delivery("cse", DISCORD_WEBHOOK_URL, send_simple_error_log)
 
         session = get_session()
-        any_changes = False
-
-        # 게시판 목록 반복
-        for board in TARGET_BOARDS:
-            if check_board(session, board, saved_data):
-                any_changes = True
-        
-        # 변경사항 있으면 저장
-        if any_changes:
-            with open(DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(saved_data, f, ensure_ascii=False, indent=4)
-            print("☑ 데이터 저장 완료")
-        else:
-            print("☒ 변동 사항 없음")
+        pipeline = NoticePipeline(
+            "cse", DATA_FILE, DISCORD_WEBHOOK_URL, render_batch_alert, CANARY_RATIOS, budget,
+            alert=send_simple_error_log, digest_title="CSE 공지",
+            mirror=(get_session, {"headers": HEADERS})
+        )
+        # 게시판 확인 → 새 글 전송(게시판 간 중복은 1건으로) → 저장
+        pipeline.run(TARGET_BOARDS, lambda board, last_id: scan_board(session, board, budget))
 
     except Exception as e:
         print(f"⚠ 치명적인 오류 발생: {e}")
         traceback.print_exc()
         send_simple_error_log(f"프로그램 강제 종료\n{str(e)}")
 
+    finally:
+        # 남은 알림 전송을 기다린 뒤 outbox 깊이 보고
+        finish_delivery("cse", budget.final_timeout(60))
+        # 호스트별 새 연결(핸드셰이크) 수 / 연결 시간
+        http_client.report("cse")
+        budget.finish()
+
 
 if __name__ == "__main__":
-    run_bot()
\ No newline at end of file
+    # --profile: 게시판별 프로파일 기록
+    run_profiled("cse", run_bot)
\ No newline at end of file
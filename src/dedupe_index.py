@@ -0,0 +1,174 @@
+import os
+import re
+import time
+import zlib
+import hashlib
+from state_store import load_state, update_state
+
+# ===[게시판 간 중복 공지 감지]===
+# 같은 공지가 학사공지/교내일반소식(또는 기숙사/도서관)에 동시에 올라오는 경우를
+# 제목 3-gram 의 MinHash 서명 + LSH 버킷으로 찾아서 알림 1건으로 합침
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEDUPE_FILE = os.path.join(BASE_DIR, "..", "data", "dedupe_data.json")
+
+NUM_PERM = 32          # 서명 길이
+BANDS = 8              # LSH 밴드 수 (밴드당 4개) → 유사도 0.6 부근부터 후보
+THRESHOLD = 0.8        # 추정 자카드 유사도가 이 이상이면 같은 공지
+MAX_ENTRIES = 500      # 최근 공지만 보관
+MAX_AGE = 7 * 86400    # 보관 기간(초)
+
+_PRIME = (1 << 61) - 1
+_MASK = 0xFFFFFFFF
+_PERMS = [
+    (int.from_bytes(hashlib.blake2b(b"a%d" % i, digest_size=8).digest(), "big") % _PRIME or 1,
+     int.from_bytes(hashlib.blake2b(b"b%d" % i, digest_size=8).digest(), "big") % _PRIME)
+    for i in range(NUM_PERM)
+]
+
+
+# ===[서명 계산]===
+def normalize_title(title):
+    """괄호 머리말/공백/기호 제거 (예: "[학사] 수강 신청 안내!" → "학사수강신청안내")"""
+    return re.sub(r'[^0-9a-z가-힣]', '', title.lower())
+
+
+def shingles(title, k=3):
+    text = normalize_title(title)
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def minhash(title):
+    """제목 → MinHash 서명 (32비트 x NUM_PERM)"""
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(title)]
+    return [min(((a * h + b) % _PRIME) & _MASK for h in hashes) for a, b in _PERMS]
+
+
+def similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def _band_keys(sig):
+    rows = NUM_PERM // BANDS
+    return [f"{band}:{zlib.crc32(repr(sig[band * rows:(band + 1) * rows]).encode())}" for band in range(BANDS)]
+
+
+def _encode(sig):
+    return "".join(f"{v:08x}" for v in sig)
+
+
+def _decode(text):
+    return [int(text[i:i + 8], 16) for i in range(0, len(text), 8)]
+
+
+# ===[색인]===
+class _Index:
+    """최근 공지 서명 + LSH 버킷 (버킷은 파일에 저장하지 않고 읽을 때 다시 만듦)"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.buckets = {}
+        for key, entry in entries.items():
+            self._add_buckets(key, _decode(entry["sig"]))
+
+    def _add_buckets(self, key, sig):
+        for band_key in _band_keys(sig):
+            self.buckets.setdefault(band_key, set()).add(key)
+
+    def find(self, sig, exclude_board):
+        """다른 게시판의 가장 비슷한 공지 (없으면 None) - 같은 밴드 후보만 비교"""
+        candidates = set()
+        for band_key in _band_keys(sig):
+            candidates |= self.buckets.get(band_key, set())
+        best, best_score = None, THRESHOLD
+        for key in candidates:
+            entry = self.entries[key]
+            if entry["board"] == exclude_board:
+                continue
+            score = similarity(sig, _decode(entry["sig"]))
+            if score >= best_score:
+                best, best_score = entry, score
+        return best
+
+    def add(self, entry, sig):
+        key = f"{entry['board']}#{entry['id']}"
+        entry["sig"] = _encode(sig)
+        self.entries[key] = entry
+        self._add_buckets(key, sig)
+
+
+def _prune(entries):
+    cutoff = time.time() - MAX_AGE
+    recent = sorted((e for e in entries.items() if e[1]["ts"] >= cutoff), key=lambda e: e[1]["ts"])
+    return dict(recent[-MAX_ENTRIES:])
+
+
+# ===[외부 진입점]===
+def collapse_duplicates(channel, batches):
+    """
+    batches: [(게시판 key, 게시판 이름, 새 공지 리스트), ...] (게시판 순서대로)
+    - 이번 실행에서 여러 게시판에 올라온 같은 공지 → 처음 나온 게시판에 1건만 남기고
+      notice["also"] 에 다른 게시판 이름을 기록
+    - 같은 채널(웹후크)로 이미 보낸 공지 → 제외
+    - 다른 채널로 보낸 공지 → 남기되 also 에 그 게시판 이름 표시
+    합치기/제외는 정규화한 제목이 완전히 같을 때만, 비슷하기만 하면 남기고 also 표시
+    같은 구조의 batches 를 반환 (공지가 모두 빠진 게시판은 제외)
+    """
+    if not batches:
+        return batches
+    try:
+        index = _Index(_prune(load_state(DEDUPE_FILE).get("entries", {})))
+    except Exception as e:
+        print(f"⚠ [중복 감지] 색인 읽기 실패 - 건너뜀: {e}")
+        return batches
+
+    now = time.time()
+    this_run = {}      # 색인 key → 이번 실행에서 남긴 공지
+    result = []
+    for board_key, board_name, notices in batches:
+        kept = []
+        for notice in notices:
+            sig = minhash(notice["title"])
+            match = index.find(sig, board_key)
+            entry = {"board": board_key, "board_name": board_name, "channel": channel,
+                     "id": notice["id"], "title": notice["title"], "ts": now}
+            # 제목이 (정규화 후) 완전히 같을 때만 합치거나 뺌 - "1차"/"2차"처럼 비슷하기만 한 공지는 표시만
+            exact = match and normalize_title(match["title"]) == normalize_title(notice["title"])
+            if match and exact:
+                match_key = f"{match['board']}#{match['id']}"
+                if match_key in this_run:
+                    original = this_run[match_key]
+                    original.setdefault("also", [])
+                    if board_name not in original["also"]:
+                        original["also"].append(board_name)
+                    print(f"  ⧉ [중복] '{notice['title']}' → [{match['board_name']}] 알림에 합침")
+                    index.add(entry, sig)
+                    this_run[f"{board_key}#{notice['id']}"] = original
+                    continue
+                if match["channel"] == channel:
+                    print(f"  ⧉ [중복] '{notice['title']}' → 이미 [{match['board_name']}]로 전송됨")
+                    index.add(entry, sig)
+                    continue
+                notice = dict(notice, also=[match["board_name"]])
+            elif match:
+                print(f"  ⧉ [비슷한 공지] '{notice['title']}' ~ [{match['board_name']}] '{match['title']}' - 표시만")
+                notice = dict(notice, also=[match["board_name"]])
+            else:
+                notice = dict(notice)
+            index.add(entry, sig)
+            this_run[f"{board_key}#{notice['id']}"] = notice
+            kept.append(notice)
+        if kept:
+            result.append((board_key, board_name, kept))
+
+    def save(data):
+        entries = data.get("entries", {})
+        entries.update(index.entries)
+        data["entries"] = _prune(entries)
+
+    try:
+        update_state(DEDUPE_FILE, save)
+    except Exception as e:
+        print(f"⚠ [중복 감지] 색인 저장 실패: {e}")
+    return result
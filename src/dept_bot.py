@@ -0,0 +1,246 @@
+import os
+import time
+import json
+import zlib
+import random
+import asyncio
+import argparse
+import traceback
+from collections import Counter
+from urllib.parse import urlparse
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup
+from dotenv import load_dotenv
+from cse_bot import HEADERS, parse_board_row, CANARY_RATIOS
+from discord_render import build_notice_payloads
+from state_store import load_state, save_state
+from selector_canary import check_selectors
+from outbox import start_delivery, enqueue, finish_delivery
+from notice_core import diff_notices
+import http_client
+
+load_dotenv()
+
+# ===[설정 영역]==========================
+# computer.cnu.ac.kr 와 같은 CMS(table.board-table / .b-title-box / articleNo=)를 쓰는
+# 학과 게시판 여러 개를 프로세스 풀로 나눠서 동시에 확인
+DISCORD_WEBHOOK_URL = os.environ.get("dept_WEBHOOK_URL")
+MONITOR_WEBHOOK_URL = os.environ.get("MONITOR_WEBHOOK_URL")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(BASE_DIR, "..", "data", "dept_data.json")
+# 게시판 목록: [{"id": "학과:게시판", "name": "...", "url": "..."}] (형식은 dept_boards.example.json 참고)
+BOARDS_FILE = os.environ.get("DEPT_BOARDS_FILE") or os.path.join(BASE_DIR, "dept_boards.json")
+
+WORKERS = int(os.environ.get("DEPT_WORKERS") or os.cpu_count() or 1)   # 프로세스 수
+PER_HOST_LIMIT = int(os.environ.get("DEPT_PER_HOST_LIMIT", 2))        # 워커 1개당 호스트별 동시 요청 수
+PER_HOST_DELAY = (1.0, 2.0)                                            # 같은 호스트 요청 간 대기(초)
+# ==========================================
+
+
+# ===[게시판 목록 읽기]===
+def load_boards(path=BOARDS_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ===[샤딩]===
+def shard_boards(boards, workers):
+    """호스트별로 묶은 뒤 워커에 골고루 분배 (같은 호스트는 가능한 한 같은 워커로)"""
+    by_host = {}
+    for order, board in enumerate(boards):
+        by_host.setdefault(urlparse(board["url"]).netloc, []).append((order, board))
+    shards = [[] for _ in range(max(1, workers))]
+    # 큰 호스트부터 가장 가벼운 샤드에 배치
+    for host_boards in sorted(by_host.values(), key=len, reverse=True):
+        min(shards, key=len).extend(host_boards)
+    return [shard for shard in shards if shard]
+
+
+# ===[워커: 비동기 수집]===
+def synthetic_page(board, rows=30, newest=None):
+    """벤치마크용 합성 목록 페이지 (실제 CMS 마크업과 같은 구조)"""
+    newest = newest or 500000 + (zlib.crc32(board["id"].encode()) % 1000) * 100
+    body = []
+    for i in range(rows):
+        top = ' class="b-top-box"' if i < 3 else ''
+        article = newest - i
+        body.append(
+            f'<tr{top}><td class="b-num-box">{article}</td><td class="b-td-left">'
+            f'<div class="b-title-box"><a href="?mode=view&amp;articleNo={article}&amp;article.offset=0" '
+            f'title="{board["name"]} 공지 {article} 자세히 보기">{board["name"]} 공지 {article}</a></div></td>'
+            f'<td>작성자</td><td>2026.10.19</td><td>{i}</td></tr>'
+        )
+    return ('<html><body><div class="bn-list-common"><table class="board-table"><thead><tr><th>번호</th></tr></thead>'
+            f'<tbody>{"".join(body)}</tbody></table></div></body></html>')
+
+
+def parse_page(html, board, last_id):
+    """목록 HTML → (새 공지 리스트, 최대 ID, 셀렉터 적중 수)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    hits = Counter()
+    rows = (parse_board_row(row, board["url"], hits) for row in soup.select('table.board-table tbody tr'))
+    new_notices, max_id = diff_notices((notice for notice in rows if notice), last_id)
+    return new_notices, max_id, hits
+
+
+async def _crawl_board(session, host_limits, order, board, last_id, synthetic):
+    host = urlparse(board["url"]).netloc
+    result = {"order": order, "board": board, "last_id": last_id, "notices": [], "max_id": last_id,
+              "hits": Counter(), "error": None}
+    try:
+        async with host_limits.setdefault(host, asyncio.Semaphore(PER_HOST_LIMIT)):
+            if synthetic:
+                await asyncio.sleep(synthetic)   # 네트워크 대기 흉내
+                html = synthetic_page(board)
+            else:
+                await asyncio.sleep(random.uniform(*PER_HOST_DELAY))
+                response = await session.get(board["url"], headers=HEADERS, timeout=30, impersonate="chrome120")
+                response.raise_for_status()
+                html = response.content.decode("utf-8", errors="replace")
+        # 파싱은 CPU 작업 → 프로세스마다 병렬로 돌아감
+        result["notices"], result["max_id"], result["hits"] = parse_page(html, board, last_id)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+async def _crawl_shard_async(shard, last_ids, synthetic):
+    host_limits = {}
+    if synthetic:
+        session = None
+        tasks = [_crawl_board(session, host_limits, order, board, last_ids.get(board["id"], 0), synthetic)
+                 for order, board in shard]
+        return await asyncio.gather(*tasks)
+    from curl_cffi.requests import AsyncSession
+    async with AsyncSession() as session:
+        tasks = [_crawl_board(session, host_limits, order, board, last_ids.get(board["id"], 0), synthetic)
+                 for order, board in shard]
+        return await asyncio.gather(*tasks)
+
+
+def crawl_shard(shard, last_ids, synthetic=0):
+    """프로세스 워커 진입점: 자기 샤드를 이벤트 루프 하나로 수집"""
+    return asyncio.run(_crawl_shard_async(shard, last_ids, synthetic))
+
+
+# ===[전체 수집]===
+def crawl_all(boards, last_ids, workers=WORKERS, synthetic=0):
+    """게시판을 워커 수만큼 나눠 수집하고, 원래 게시판 순서대로 합친 결과 반환"""
+    shards = shard_boards(boards, workers)
+    if len(shards) == 1:
+        results = crawl_shard(shards[0], last_ids, synthetic)
+    else:
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [pool.submit(crawl_shard, shard, last_ids, synthetic) for shard in shards]
+            results = [r for future in futures for r in future.result()]
+    return sorted(results, key=lambda r: r["order"])
+
+
+# ===[관리자 알림]===
+def send_simple_error_log(error_msg=None):
+    """[관리자용] 에러 발생 사실만 간단하게 알림"""
+    if not MONITOR_WEBHOOK_URL:
+        return
+    now = time.strftime('%Y-%m-%d %H:%M:%S')
+    content = f"🚨 **[학과 통합 공지봇 오류]**\n시간: {now}\n에러: ```{error_msg}```"
+    try:
+        http_client.post(MONITOR_WEBHOOK_URL, json={"content": content}, timeout=5)
+        print("✉ [관리자 알림 전송 완료]")
+    except:
+        print("⚠ 관리자 알림 전송 실패")
+
+
+# ===[MAIN]===
+def run_bot():
+    print("\n" + "━" * 40)
+    print(f"🤖 학과 통합 공지봇 실행: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    try:
+        boards = load_boards()
+        if not boards:
+            print(f"☒ 게시판 목록 없음: {BOARDS_FILE}")
+            return
+        saved_data = load_state(DATA_FILE)
+
+        started = time.monotonic()
+        results = crawl_all(boards, saved_data, WORKERS)
+        print(f"● {len(boards)}개 게시판 수집 완료 ({WORKERS}개 프로세스, {time.monotonic() - started:.1f}초)")
+        # 전송 스레드는 프로세스 풀(fork)이 끝난 뒤에 시작
+        start_delivery("dept", DISCORD_WEBHOOK_URL, send_simple_error_log)
+
+        failures = []
+        any_changes = False
+        # 게시판 순서대로 전송/저장
+        for result in results:
+            board, last_id = result["board"], result["last_id"]
+            if result["error"]:
+                failures.append(f"{board['name']}: {result['error']}")
+                continue
+            if check_selectors(f"dept:{board['id']}", result["hits"], CANARY_RATIOS, send_simple_error_log):
+                continue
+            if last_id == 0 and result["max_id"] > 0:
+                print(f"☐ [{board['name']}] 최초 실행 - 기준점(ID: {result['max_id']})만 설정, 전송 X")
+            elif result["notices"]:
+                # outbox 에 먼저 기록 → 기준 ID 저장 (전송은 백그라운드, 실패 시 다음 실행에 재시도)
+                header = f"### 🏫 [{board['name']}] 새 글 {len(result['notices'])}건\n\n"
+                if not enqueue("dept", DISCORD_WEBHOOK_URL, f"{board['name']} - {len(result['notices'])}건",
+                               build_notice_payloads(header, result["notices"])):
+                    # outbox 에 못 넣음(웹후크 URL 없음) → 기준 ID 유지
+                    failures.append(f"{board['name']}: 웹후크 URL이 없음")
+                    continue
+            else:
+                continue
+            saved_data[board["id"]] = result["max_id"]
+            any_changes = True
+
+        if failures:
+            print(f"⚠ 접속 실패 {len(failures)}건")
+            send_simple_error_log("\n".join(failures[:20]))
+
+        if any_changes:
+            save_state(DATA_FILE, saved_data)
+            print("☑ 데이터 저장 완료")
+        else:
+            print("☒ 변동 사항 없음")
+
+    except Exception as e:
+        print(f"⚠ 치명적인 오류 발생: {e}")
+        traceback.print_exc()
+        send_simple_error_log(f"프로그램 강제 종료\n{str(e)}")
+
+    finally:
+        finish_delivery("dept")
+        # 호스트별 새 연결(핸드셰이크) 수 / 연결 시간
+        http_client.report("dept")
+
+
+# ===[벤치마크]===
+def run_benchmark(board_count, latency):
+    """합성 게시판 N개로 프로세스 수별 처리량 측정 (네트워크 접속 없음)"""
+    boards = [{"id": f"bench{i}:notice", "name": f"벤치{i}",
+               "url": f"https://dept{i % 50}.example.invalid/notice.do?articleLimit=30"} for i in range(board_count)]
+    last_ids = {b["id"]: 0 for b in boards}
+    counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    base = None
+    print(f"📊 합성 게시판 {board_count}개 / 호스트 50개 / 응답 지연 {latency * 1000:.0f}ms")
+    for workers in counts:
+        started = time.monotonic()
+        results = crawl_all(boards, last_ids, workers, synthetic=latency or 1e-6)
+        elapsed = time.monotonic() - started
+        base = base or elapsed
+        parsed = sum(1 for r in results if r["max_id"] and not r["error"])
+        print(f"- 프로세스 {workers:>2}개: {elapsed:6.2f}초, {board_count / elapsed:7.1f}개/초, "
+              f"가속 {base / elapsed:4.2f}배 (성공 {parsed}/{board_count})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="학과 게시판 통합 공지봇")
+    parser.add_argument("--bench", type=int, metavar="N", help="합성 게시판 N개로 확장성 벤치마크")
+    parser.add_argument("--latency", type=float, default=0.0, help="벤치마크 응답 지연(초)")
+    args = parser.parse_args()
+    if args.bench:
+        run_benchmark(args.bench, args.latency)
+    else:
+        run_bot()
@@ -0,0 +1,96 @@
+import os
+import time
+from discord_render import build_payloads, render_notice_line
+from state_store import load_state, update_state
+from outbox import enqueue
+
+# ===[모아보기(다이제스트) 설정]===
+# 신청한 게시판은 매번 알림 대신 버퍼에 모았다가 정해진 주기마다 한 번에 전송
+#   DIGEST_BOARDS="cse:general,cse:job"  (게시판 key, 쉼표 구분)
+#   DIGEST_INTERVAL_HOURS=24             (전송 주기, 시간)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DIGEST_FILE = os.path.join(BASE_DIR, "..", "data", "digest_data.json")
+
+DIGEST_BOARDS = {key.strip() for key in os.environ.get("DIGEST_BOARDS", "").split(",") if key.strip()}
+INTERVAL = float(os.environ.get("DIGEST_INTERVAL_HOURS", 24)) * 3600
+MAX_ITEMS = 100      # 게시판별 최대 보관 수 (넘으면 오래된 글부터 버림)
+
+
+def is_digest_board(board_key):
+    return board_key in DIGEST_BOARDS
+
+
+# ===[버퍼에 추가]===
+def add_to_digest(bot, board_key, board_name, notices):
+    """새 글을 모아보기 버퍼에 추가 (글 ID로 중복 제거, 게시판별 MAX_ITEMS 유지)"""
+    def update(data):
+        bot_data = data.setdefault(bot, {"last_flush": time.time(), "boards": {}})
+        board = bot_data["boards"].setdefault(board_key, {"name": board_name, "items": []})
+        board["name"] = board_name
+        known = {item["id"] for item in board["items"]}
+        added = 0
+        for notice in notices:
+            if notice["id"] in known:
+                continue
+            board["items"].append({
+                "id": notice["id"], "title": notice["title"],
+                "link": notice["link"], "is_top": notice.get("is_top", False)
+            })
+            known.add(notice["id"])
+            added += 1
+        del board["items"][:-MAX_ITEMS]
+        return added
+
+    added = update_state(DIGEST_FILE, update)
+    print(f"🗞 [{board_name}] 모아보기에 {added}건 추가")
+    return added
+
+
+# ===[렌더링]===
+def render_digest(title, boards, mode=None):
+    """게시판별로 묶고, 각 게시판은 고정글(is_top) 먼저 → 오래된 글 순"""
+    total = sum(len(board["items"]) for board in boards.values())
+    header = f"### 🗞 [{title}] 모아보기 {total}건\n\n"
+    blocks = []
+    for board in boards.values():
+        if not board["items"]:
+            continue
+        blocks.append(f"**{board['name']}** ({len(board['items'])}건)\n")
+        ordered = sorted(board["items"], key=lambda n: (not n["is_top"], str(n["id"]).zfill(32)))
+        blocks.extend(render_notice_line(n, mode) for n in ordered)
+        blocks.append("\n")
+    return build_payloads(header, blocks, mode)
+
+
+# ===[주기 전송]===
+def flush_digest(bot, webhook_url, title, force=False):
+    """주기가 지났으면 모아둔 글을 outbox 에 넘기고 버퍼를 비움 (재시도는 outbox 가 담당)"""
+    data = load_state(DIGEST_FILE).get(bot, {})
+    boards = data.get("boards", {})
+    pending = {key: board for key, board in boards.items() if board["items"]}
+    if not pending:
+        return 0
+    if not force and time.time() - data.get("last_flush", 0) < INTERVAL:
+        return 0
+    if not webhook_url:
+        print("⚠ 웹후크 URL이 없음 (모아보기 보류)")
+        return 0
+
+    count = sum(len(board["items"]) for board in pending.values())
+    if not enqueue(bot, webhook_url, f"{title} 모아보기 - {count}건", render_digest(title, pending)):
+        return 0
+
+    sent_ids = {key: {item["id"] for item in board["items"]} for key, board in pending.items()}
+
+    def clear(current):
+        bot_data = current.setdefault(bot, {"boards": {}})
+        bot_data["last_flush"] = time.time()
+        for key, ids in sent_ids.items():
+            board = bot_data["boards"].get(key)
+            if board:
+                # 전송하는 사이 새로 들어온 글은 남김
+                board["items"] = [item for item in board["items"] if item["id"] not in ids]
+
+    update_state(DIGEST_FILE, clear)
+    print(f"🗞 [모아보기] {title} - {count}건 전송 대기열에 추가")
+    return count
@@ -0,0 +1,179 @@
+import os
+import time
+from curl_cffi import requests, CurlECode
+from http_client import get_client
+
+# ===[디스코드 제한값]===
+# https://discord.com/developers/docs/resources/message#create-message
+CONTENT_LIMIT = 2000          # content 최대 글자 수
+EMBED_TITLE_LIMIT = 256       # embed 제목 최대 글자 수
+EMBED_DESC_LIMIT = 4096       # embed 본문 최대 글자 수
+EMBEDS_PER_MESSAGE = 10       # 메시지 1건당 embed 최대 개수
+EMBED_TOTAL_LIMIT = 6000      # 메시지 1건의 embed 글자 수 합계 한도
+
+# "embed" 또는 "content" (기본: embed → 한 번에 더 많이 담김)
+RENDER_MODE = os.environ.get("DISCORD_RENDER_MODE", "embed")
+EMBED_COLOR = 0x1E6FD9
+
+
+def _truncate(text, limit):
+    """한도를 넘는 블록은 말줄임 처리"""
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1] + "…"
+
+
+# ===[공지 한 줄 렌더링]===
+def render_notice_line(notice, mode=None):
+    """▶/▷ 아이콘 + 링크 제목 한 줄 생성"""
+    mode = mode or RENDER_MODE
+    icon = "▶" if notice['is_top'] else "▷"
+    # 다른 게시판에도 올라온 공지 (중복 감지로 합쳐진 경우)
+    also = f" (+ {', '.join(notice['also'])})" if notice.get('also') else ""
+    if mode == "embed":
+        # embed 안에서는 <링크> 표기가 깨지므로 일반 링크 사용
+        return f"{icon} [{notice['title']}]({notice['link']}){also}\n"
+    return f"{icon} [{notice['title']}](<{notice['link']}>){also}\n"
+
+
+# ===[content 묶음 생성]===
+def pack_content(header, blocks, limit=CONTENT_LIMIT):
+    """header + blocks를 순서대로 limit 이하 content payload 리스트로 묶음"""
+    payloads = []
+    current = header
+    for block in blocks:
+        block = _truncate(block, limit)
+        if current and len(current) + len(block) > limit:
+            payloads.append({"content": current})
+            current = ""
+        current += block
+    if current:
+        payloads.append({"content": current})
+    return payloads
+
+
+# ===[embed 묶음 생성]===
+def pack_embeds(title, blocks, color=EMBED_COLOR):
+    """blocks를 embed(본문 4096자)로 나누고, 메시지당 10개/6000자 한도까지 채워 묶음"""
+    title = _truncate(title, EMBED_TITLE_LIMIT)
+    payloads = []
+    embeds = []          # 현재 메시지에 담긴 embed
+    total = 0            # 현재 메시지의 글자 수 합계
+    desc = ""            # 작성 중인 embed 본문
+    embed_title = title  # 첫 embed에만 제목 표시
+
+    def close_embed():
+        nonlocal desc, embed_title, total
+        embed = {"description": desc, "color": color}
+        if embed_title:
+            embed["title"] = embed_title
+        embeds.append(embed)
+        total += len(embed_title) + len(desc)
+        desc, embed_title = "", ""
+
+    def close_message():
+        nonlocal embeds, total
+        payloads.append({"embeds": embeds})
+        embeds, total = [], 0
+
+    for block in blocks:
+        block = _truncate(block, EMBED_DESC_LIMIT)
+        # 1) 현재 embed에 이어 붙일 수 있는 경우
+        if (len(desc) + len(block) <= EMBED_DESC_LIMIT
+                and total + len(embed_title) + len(desc) + len(block) <= EMBED_TOTAL_LIMIT):
+            desc += block
+            continue
+        # 2) 현재 embed를 닫고, 같은 메시지에 새 embed를 추가할 수 있는 경우
+        if desc:
+            close_embed()
+        if len(embeds) >= EMBEDS_PER_MESSAGE or total + len(block) > EMBED_TOTAL_LIMIT:
+            # 3) 메시지가 가득 참 → 다음 메시지로
+            close_message()
+        desc = block
+
+    if desc or embed_title:
+        close_embed()
+    if embeds:
+        close_message()
+    return payloads
+
+
+# ===[통합 렌더러]===
+def build_payloads(header, blocks, mode=None):
+    """모드에 맞춰 웹후크 payload 리스트 생성 (전송 없이 오프라인 확인 가능)"""
+    mode = mode or RENDER_MODE
+    if mode == "embed":
+        return pack_embeds(header.strip().lstrip("#").strip(), blocks)
+    return pack_content(header, blocks)
+
+
+def build_notice_payloads(header, notices, mode=None):
+    """공지 리스트 → payload 리스트"""
+    mode = mode or RENDER_MODE
+    lines = [render_notice_line(n, mode) for n in notices]
+    return build_payloads(header, lines, mode)
+
+
+# ===[전송기]===
+MAX_ATTEMPTS = 5      # payload 1건당 최대 시도 횟수 (429/5xx/연결 실패)
+MAX_BACKOFF = 30      # 재시도 대기 상한(초)
+# 요청을 보내기 전(연결 단계)에 실패한 경우만 재시도 - 응답 없음(GOT_NOTHING/RECV_ERROR)은 이미 전송됐을 수 있음
+CONNECT_ERRORS = (CurlECode.COULDNT_RESOLVE_HOST, CurlECode.COULDNT_RESOLVE_PROXY,
+                  CurlECode.COULDNT_CONNECT, CurlECode.SSL_CONNECT_ERROR)
+
+
+def _retry_after(response, attempt):
+    """429/5xx 응답에서 대기 시간(초) 계산: Retry-After → retry_after → 지수 백오프"""
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return min(float(header), MAX_BACKOFF)
+        except ValueError:
+            pass
+    try:
+        return min(float(response.json().get("retry_after")), MAX_BACKOFF)
+    except Exception:
+        return min(2 ** (attempt - 1), MAX_BACKOFF)
+
+
+def _is_connect_error(error):
+    """DNS 실패/연결 거부/연결 timeout/TLS 연결 실패 → 디스코드가 받지 못한 게 확실"""
+    code = getattr(error, "code", None)
+    if code == CurlECode.OPERATION_TIMEDOUT:
+        # 같은 코드라도 본문 전송 후 timeout 은 이미 처리됐을 수 있음
+        return "Connection timed out after" in str(error) or "Resolving timed out after" in str(error)
+    return code in CONNECT_ERRORS
+
+
+def post_payloads(webhook_url, payloads, session=None, timeout=5):
+    """payload를 순서대로 전송(429/5xx는 대기 후 재시도), 성공한 개수 반환 (실패 시 예외 발생)"""
+    # 기본은 공용 클라이언트 → 같은 웹후크 호스트로의 연결/TLS 세션 재사용
+    poster = session or get_client()
+    sent = 0
+    for payload in payloads:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                response = poster.post(webhook_url, json=payload, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                # 연결 자체가 안 된 경우만 재시도 (응답 없음/읽기 timeout 은 이미 전송됐을 수 있어 중복 위험)
+                if not _is_connect_error(e) or attempt == MAX_ATTEMPTS:
+                    raise
+                time.sleep(min(2 ** (attempt - 1), MAX_BACKOFF))
+                continue
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt == MAX_ATTEMPTS:
+                    response.raise_for_status()
+                wait = _retry_after(response, attempt)
+                print(f"  ⏳ [디스코드 {response.status_code}] {wait:.1f}초 후 재시도 ({attempt}/{MAX_ATTEMPTS})")
+                time.sleep(wait)
+                continue
+            response.raise_for_status()
+            break
+        sent += 1
+        # 버킷을 다 쓴 경우 리셋될 때까지 미리 대기 (다음 요청의 429 방지)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                time.sleep(min(float(response.headers.get("X-RateLimit-Reset-After", 0)), MAX_BACKOFF))
+            except ValueError:
+                pass
+    return sent
@@ -1,16 +1,20 @@
-import requests
-from bs4 import BeautifulSoup
 import os
 import time
-import json
 import re
 import urllib3
 import traceback 
 import random
+from collections import Counter
 from fake_useragent import UserAgent
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from dotenv import load_dotenv
+from discord_render import build_notice_payloads
+from list_stream import iter_rows
+from profiler import run_profiled
+from outbox import start_delivery, finish_delivery
+from run_budget import RunBudget
+from notice_core import Notice, NoticePipeline
+import http_client
+from http_client import get_client
 load_dotenv()
 
 # ===[설정 영역]==========================
@@ -23,7 +27,8 @@ TARGET_BOARDS = [
     {
         "id": "movein",
         "name": "입주/퇴거 공지",
-        "url": "https://dorm.cnu.ac.kr/_prog/_board/?code=sub05_0501&site_dvs_cd=kr&menu_dvs_cd=030101"
+        "url": "https://dorm.cnu.ac.kr/_prog/_board/?code=sub05_0501&site_dvs_cd=kr&menu_dvs_cd=030101",
+        "priority": 0   # 실행 시간이 모자라도 먼저 확인 (기본값 1, 낮을수록 먼저)
     },
     {
         "id": "general",
@@ -36,6 +41,8 @@ TARGET_BOARDS = [
         "url": "https://dorm.cnu.ac.kr/_prog/_board/?code=sub03_0302&site_dvs_cd=kr&menu_dvs_cd=0303"
     }
 ]
+# 셀렉터 감시: (적중, 분모) - 줄 → td.title → 링크 → 글 ID
+CANARY_RATIOS = [("title_cells", "rows"), ("anchors", "title_cells"), ("ids", "anchors")]
 # ==========================================
 
 # ===[랜덤 헤더 생성기]===
@@ -50,13 +57,8 @@ def get_random_headers():
 
 # ===[세션 생성기]===
 def get_session():
-    """Retry 가능한 세션 생성"""
-    session = requests.Session()
-    retry = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
-    return session
+    """공용 HTTP 클라이언트 (연결/DNS/TLS 세션 재사용, verify·5xx 재시도는 http_client 의 호스트 설정)"""
+    return get_client()
 
 # ===[ID 추출기]===
 def extract_id_from_link(link):
@@ -67,26 +69,10 @@ def extract_id_from_link(link):
     return 0
 
 # ===[디코 전송기]===
-def send_discord_batch_alert(category_name, new_notices):
-    if not new_notices: return
-    
-    if not DISCORD_WEBHOOK_URL:
-        print("⚠ 웹후크 URL이 없음")
-        send_simple_error_log("웹후크 URL이 없음")
-        return
-
-    count = len(new_notices)
-    message_content = f"### 🛌 [{category_name}] 새 글 {count}건\n\n"
-    
-    for notice in new_notices:
-        icon = "▶" if notice['is_top'] else "▷"
-        message_content += f"{icon} [{notice['title']}](<{notice['link']}>)\n"
-    try:
-        requests.post(DISCORD_WEBHOOK_URL, json={"content": message_content})
-        print(f"✉ [전송 완료] {category_name} - {count}건")
-    except Exception as e:
-        print(f"⚠ [전송 실패] {e}")
-        send_simple_error_log("공지 전송 실패")
+def render_batch_alert(category_name, new_notices):
+    """전송할 payload 리스트 생성 (2000자/embed 한도 자동 분할)"""
+    header = f"### 🛌 [{category_name}] 새 글 {len(new_notices)}건\n\n"
+    return build_notice_payloads(header, new_notices)
 
 # 관리자 함수
 def send_simple_error_log(error_msg=None):
@@ -103,94 +89,69 @@ def send_simple_error_log(error_msg=None):
     else:
         content = f"🚨 **[기숙사 봇 오류]** \n{now}"
     try:
-        requests.post(MONITOR_WEBHOOK_URL, json={"content": content}, timeout=5)
+        http_client.post(MONITOR_WEBHOOK_URL, json={"content": content}, timeout=5)
         print("✉ [관리자 알림 전송 완료]")
     except:
         print("⚠ 관리자 알림 전송 실패")
 
-# ===[게시판 검사]===
-def check_board(session, board_info, saved_data):
-    board_id = board_info["id"]
-    board_name = board_info["name"]
-    url = board_info["url"]
+# ===[게시글 줄 파싱]===
+def parse_board_row(row, hits=None):
+    """목록의 tr 한 줄 → Notice (제목/링크/ID 없으면 None), hits에 셀렉터 적중 수 기록"""
+    hits = hits if hits is not None else Counter()
+    hits["rows"] += 1
+    title_td = row.select_one('td.title')
+    if not title_td: return None
+    hits["title_cells"] += 1
+    
+    a_tag = title_td.select_one('a')
+    if not a_tag: return None
+    hits["anchors"] += 1
 
-    print(f"⌕ [{board_name}] 분석 중...")
+    title = a_tag.get('title') or a_tag.text.strip()
+    href = a_tag.get('href')
     
-    try:
-        # 1) 인터넷 접속 (timeout 10 -> 30 변경)
-        response = session.get(url, headers=get_random_headers(), verify=False, timeout=30)
-        response.encoding = 'utf-8'
-
-        # 3) HTML 파싱
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # 4) 게시글 줄(Row) 탐색
-        rows = soup.select('tbody > tr')
-        if not rows:
-            send_simple_error_log("게시글(tr)을 찾을 수 없음")
-            raise Exception(f"⚠ [{board_name}] 게시글(tr)을 찾을 수 없음 (HTML 구조 변경 의심)")
-
-        # 5) 마지막으로 읽은 ID 불러오기
-        last_id = saved_data.get(board_id, 0)
-        
-        new_notices = []
-        max_id = last_id 
-
-        # 6) 각 줄(tr) 반복 검사
-        for row in rows:
-            title_td = row.select_one('td.title')
-            if not title_td: continue
-            
-            a_tag = title_td.select_one('a')
-            if not a_tag: continue
-
-            title = a_tag.get('title') or a_tag.text.strip()
-            href = a_tag.get('href')
-            
-            if href.startswith("?"):
-                link = f"https://dorm.cnu.ac.kr/_prog/_board/{href}"
-            elif href.startswith("/"):
-                link = f"https://dorm.cnu.ac.kr{href}"
-            else:
-                link = f"https://dorm.cnu.ac.kr/_prog/_board/{href}"
-
-            article_id = extract_id_from_link(link)
-            if article_id == 0: continue
-
-            is_top = False
-            num_td = row.select_one('td.num')
-            if num_td and "공지" in num_td.get_text():
-                is_top = True
-
-            if article_id > last_id:
-                new_notices.append({
-                    "id": article_id,
-                    "title": title,
-                    "link": link,
-                    "is_top": is_top
-                })
-                if article_id > max_id:
-                    max_id = article_id
-
-        # 7) 최초 실행 처리
-        if last_id == 0 and max_id > 0:
-            print(f"☐ [{board_name}] 최초 실행 - 기준점(ID: {max_id})만 설정합니다.")
-            saved_data[board_id] = max_id
-            return True
-
-       # 8) 새 글 전송
-        if new_notices:
-            new_notices.sort(key=lambda x: x['id'])
-            send_discord_batch_alert(board_name, new_notices)
-            saved_data[board_id] = max_id
-            return True
-            
-        return False
+    if href.startswith("?"):
+        link = f"https://dorm.cnu.ac.kr/_prog/_board/{href}"
+    elif href.startswith("/"):
+        link = f"https://dorm.cnu.ac.kr{href}"
+    else:
+        link = f"https://dorm.cnu.ac.kr/_prog/_board/{href}"
 
-    except Exception as e:
-        print(f"⚠ [{board_name}] 접속/파싱 실패: {e}")
-        # 에러 내용을 함께 보냄
-        send_simple_error_log(f"[{board_name}] 접속 실패\n{str(e)}")
+    article_id = extract_id_from_link(link)
+    if article_id == 0: return None
+    hits["ids"] += 1
+
+    is_top = False
+    num_td = row.select_one('td.num')
+    if num_td and "공지" in num_td.get_text():
+        is_top = True
+
+    return Notice(article_id, title, link, is_top)
+
+# ===[게시판 검사]===
+def scan_board(session, board_info, budget):
+    """게시판 1개 접속 → (공지 iterator, 셀렉터 적중 수) - 공지는 읽히는 대로 하나씩 파싱"""
+    print(f"⌕ [{board_info['name']}] 분석 중...")
+    budget.sleep(random.uniform(2, 4))
+
+    # 인터넷 접속 (timeout 10 -> 30 변경, 본문은 스트리밍으로 조금씩 읽음)
+    response = session.get(board_info["url"], headers=get_random_headers(),
+                           timeout=budget.timeout(30), stream=True)
+    hits = Counter()
+
+    def notices():
+        stats = {}
+        try:
+            # 각 줄(tr)을 읽히는 대로 검사 → 기준 ID에 닿으면 나머지는 읽지 않음
+            for row in iter_rows(response, stats=stats):
+                notice = parse_board_row(row, hits)
+                if notice:
+                    yield notice
+        except GeneratorExit:
+            print(f"  ⏹ 기준 ID 도달 - {stats['rows']}줄/{stats['bytes'] // 1024}KB 만 읽고 중단")
+            raise
+
+    return notices(), hits
 
 
 # ===[MAIN]===
@@ -200,29 +161,22 @@ def run_bot():
     
     # 인증서 경고 끄기
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    # 실행 전체 시간 예산 (모자라면 우선순위 낮은 게시판은 다음 실행으로)
+    budget = RunBudget("dorm")
     
     try:
-        saved_data = {}
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                try: saved_data = json.load(f)
-                except: saved_data = {}
+        # 지난 실행에서 못 보낸 알림은 수집하는 동안 백그라운드로 전송
+        start_delivery("dorm", DISCORD_WEBHOOK_URL, send_simple_error_log)
 
         session = get_session()
-        any_changes = False
-
-        for board in TARGET_BOARDS:
-            delay = random.uniform(2, 4)
-            time.sleep(delay)
-            if check_board(session, board, saved_data):
-                any_changes = True
-
-        if any_changes:
-            with open(DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(saved_data, f, ensure_ascii=False, indent=4)
-            print("☑ 통합 데이터 파일 저장 완료.")
-        else:
-            print("☒ 변동 사항 없음.")
+        pipeline = NoticePipeline(
+            "dorm", DATA_FILE, DISCORD_WEBHOOK_URL, render_batch_alert, CANARY_RATIOS, budget,
+            alert=send_simple_error_log, digest_title="기숙사 공지",
+            mirror=(get_session, {"headers": get_random_headers()})
+        )
+        # 게시판 확인 → 새 글 전송(게시판 간 중복은 1건으로) → 저장
+        pipeline.run(TARGET_BOARDS, lambda board, last_id: scan_board(session, board, budget))
 
     # 전체 로직 에러 처리
     except Exception as e:
@@ -230,5 +184,13 @@ def run_bot():
         traceback.print_exc()
         send_simple_error_log(f"프로그램 강제 종료\n{str(e)}")
 
+    finally:
+        # 남은 알림 전송을 기다린 뒤 outbox 깊이 보고
+        finish_delivery("dorm", budget.final_timeout(60))
+        # 호스트별 새 연결(핸드셰이크) 수 / 연결 시간
+        http_client.report("dorm")
+        budget.finish()
+
 if __name__ == "__main__":
-    run_bot()
+    # --profile: 게시판별 프로파일 기록
+    run_profiled("dorm", run_bot)
@@ -0,0 +1,153 @@
+import os
+import glob
+import json
+import time
+from datetime import datetime
+from email.utils import formatdate
+from xml.etree import ElementTree as ET
+from state_store import atomic_write, FileLock
+
+# ===[정적 피드 생성]===
+# 실행할 때마다 새 글이 생긴 게시판만 RSS 2.0 / Atom / JSON Feed 파일을 다시 씀
+#   feeds/<게시판 key>.{xml,atom,json}  +  feeds/all.{xml,atom,json} (전체 통합)
+# JSON Feed 파일이 곧 저장소 역할 (이전 항목을 읽어서 최근 N개만 유지)
+# 통합 피드는 게시판별 JSON Feed 를 모아서 매번 다시 만듦 → git 충돌 시 아무 쪽이나 골라도 다음 실행에 복구
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FEED_DIR = os.environ.get("FEED_DIR") or os.path.join(BASE_DIR, "..", "feeds")
+FEED_BASE_URL = os.environ.get("FEED_BASE_URL", "").rstrip("/")   # 공개 주소 (예: GitHub Pages)
+MAX_ITEMS = int(os.environ.get("FEED_MAX_ITEMS", 50))
+ALL_KEY = "all"
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts).astimezone().isoformat(timespec="seconds")
+
+
+def _file_name(key):
+    return key.replace(":", "-")
+
+
+def _feed_url(key, ext):
+    name = f"{_file_name(key)}.{ext}"
+    return f"{FEED_BASE_URL}/{name}" if FEED_BASE_URL else name
+
+
+def _load_items(key):
+    path = os.path.join(FEED_DIR, f"{_file_name(key)}.json")
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("items", [])
+    except (ValueError, OSError):
+        return []
+
+
+# ===[형식별 렌더링]===
+def render_json_feed(key, title, items):
+    return json.dumps({
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": title,
+        "home_page_url": items[0]["url"] if items else None,
+        "feed_url": _feed_url(key, "json"),
+        "items": items,
+    }, ensure_ascii=False, indent=2)
+
+
+def render_rss(key, title, items):
+    rss = ET.Element("rss", version="2.0")
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = title
+    ET.SubElement(channel, "link").text = _feed_url(key, "xml")
+    ET.SubElement(channel, "description").text = f"{title} 새 글"
+    for item in items:
+        node = ET.SubElement(channel, "item")
+        ET.SubElement(node, "title").text = item["title"]
+        ET.SubElement(node, "link").text = item["url"]
+        ET.SubElement(node, "guid", isPermaLink="false").text = item["id"]
+        ET.SubElement(node, "category").text = item["_board"]
+        ET.SubElement(node, "pubDate").text = formatdate(item["_ts"], localtime=True)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(rss, encoding="unicode")
+
+
+def render_atom(key, title, items):
+    ns = "http://www.w3.org/2005/Atom"
+    feed = ET.Element("feed", xmlns=ns)
+    ET.SubElement(feed, "title").text = title
+    ET.SubElement(feed, "id").text = f"urn:cnu-notice:{key}"
+    ET.SubElement(feed, "updated").text = items[0]["date_published"] if items else _iso(time.time())
+    ET.SubElement(feed, "link", rel="self", href=_feed_url(key, "atom"))
+    for item in items:
+        entry = ET.SubElement(feed, "entry")
+        ET.SubElement(entry, "title").text = item["title"]
+        ET.SubElement(entry, "id").text = f"urn:cnu-notice:{item['id']}"
+        ET.SubElement(entry, "link", href=item["url"])
+        ET.SubElement(entry, "updated").text = item["date_published"]
+        ET.SubElement(entry, "category", term=item["_board"])
+        ET.SubElement(ET.SubElement(entry, "author"), "name").text = item["_board"]
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(feed, encoding="unicode")
+
+
+# ===[피드 파일 쓰기]===
+def _write_feed(key, title, items):
+    """최근 MAX_ITEMS개로 3가지 형식 모두 다시 씀"""
+    items = sorted(items, key=lambda item: item["_ts"], reverse=True)[:MAX_ITEMS]
+    base = os.path.join(FEED_DIR, _file_name(key))
+    atomic_write(base + ".json", render_json_feed(key, title, items))
+    atomic_write(base + ".xml", render_rss(key, title, items))
+    atomic_write(base + ".atom", render_atom(key, title, items))
+
+
+def _update_feed(key, title, new_items):
+    """기존 항목 + 새 항목 (같은 ID는 새 항목 우선)"""
+    known = {item["id"] for item in new_items}
+    _write_feed(key, title, new_items + [item for item in _load_items(key) if item["id"] not in known])
+
+
+def _rebuild_all():
+    """게시판별 JSON Feed 를 모아 통합 피드 재생성"""
+    items = []
+    for path in glob.glob(os.path.join(FEED_DIR, "*.json")):
+        if os.path.basename(path) != f"{ALL_KEY}.json":
+            items.extend(_load_items(os.path.basename(path)[:-len(".json")]))
+    _write_feed(ALL_KEY, "충남대 공지 통합", items)
+
+
+def _to_item(board_key, board_name, notice, ts):
+    return {
+        "id": f"{board_key}:{notice['id']}",
+        "url": notice["link"],
+        "title": notice["title"],
+        "content_text": notice["title"],
+        "date_published": _iso(ts),
+        "tags": [board_name] + (["고정"] if notice.get("is_top") else []),
+        "_board": board_name,
+        "_ts": ts,
+    }
+
+
+# ===[외부 진입점]===
+def write_feeds(batches):
+    """
+    batches: [(게시판 key, 게시판 이름, 새 공지 리스트 - 오래된 글부터), ...]
+    새 글이 있는 게시판 피드 + 통합 피드만 다시 씀 (실패해도 봇은 계속)
+    """
+    batches = [batch for batch in batches if batch[2]]
+    if not batches:
+        return 0
+    try:
+        # 여러 봇이 동시에 통합 피드를 고쳐도 섞이지 않도록 잠금
+        with FileLock(os.path.join(FEED_DIR, ALL_KEY)):
+            ts = time.time()
+            count = 0
+            for board_key, board_name, notices in batches:
+                # 같은 실행에서 올라온 글도 ID 순서대로 정렬되도록 미세하게 시각을 벌림
+                items = [_to_item(board_key, board_name, n, ts + i / 1000) for i, n in enumerate(notices)]
+                _update_feed(board_key, board_name, items)
+                count += len(items)
+            _rebuild_all()
+        print(f"📰 [피드] {len(batches)}개 게시판 + 통합 피드 갱신 (새 글 {count}건)")
+        return count
+    except Exception as e:
+        print(f"⚠ [피드] 생성 실패: {e}")
+        return 0
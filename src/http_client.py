@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import threading
+from urllib.parse import urlsplit
+from curl_cffi import requests, CurlInfo, CurlOpt
+
+# ===[공용 HTTP 클라이언트]===
+# 게시판 요청/웹후크 전송/첨부 보관이 실행 내내 같은 curl 세션을 사용
+#  - 연결 유지 + HTTP/2 (TLS 에서 서버가 h2 를 받으면 한 연결로 여러 요청), TLS 세션 재사용
+#  - DNS 결과는 실행이 끝날 때까지 캐시 (curl 핸들은 스레드마다 1개 → 캐시도 스레드별)
+#  - 호스트별 설정(impersonate / verify / 5xx 재시도)은 HOST_SETTINGS, HTTP_HOSTS_FILE 로 덮어쓰기
+#      {"호스트": {"impersonate": "chrome120", "verify": false, "retries": 3}}
+#  - 호스트별 새 연결(핸드셰이크) 수 / 연결 시간 집계 → report()
+# stream=True 요청은 curl_cffi 가 핸들을 복제 → 연결/TLS 세션/DNS 캐시를 물려받지 않고 새로 연결
+#   (기준 ID 에서 본문 읽기를 끊으면 HTTP/1.1 연결은 어차피 다시 못 씀)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HOSTS_FILE = os.environ.get("HTTP_HOSTS_FILE") or os.path.join(BASE_DIR, "http_hosts.json")
+
+HOST_SETTINGS = {
+    # TLS 지문 위장(진짜 크롬인 척) 해야 차단 안 됨
+    "computer.cnu.ac.kr": {"impersonate": "chrome120"},
+    # 인증서 체인이 불완전 → 검증 끔, 가끔 5xx → 재시도
+    "dorm.cnu.ac.kr": {"verify": False, "retries": 3},
+    "library.cnu.ac.kr": {"verify": False, "retries": 3},
+}
+DEFAULT_SETTINGS = {"impersonate": None, "verify": True, "retries": 0}
+RETRY_STATUS = (500, 502, 503, 504)
+CURL_INFOS = [CurlInfo.NUM_CONNECTS, CurlInfo.NAMELOOKUP_TIME, CurlInfo.CONNECT_TIME, CurlInfo.APPCONNECT_TIME]
+HTTP_VERSIONS = {1: "HTTP/1.0", 2: "HTTP/1.1", 3: "HTTP/2", 30: "HTTP/3"}   # CURLINFO_HTTP_VERSION 값 (CURL_HTTP_VERSION_*)
+
+_client = None
+_client_guard = threading.Lock()
+
+
+def load_host_settings():
+    """기본 호스트 설정 + (있으면) HTTP_HOSTS_FILE 의 설정"""
+    hosts = {host: dict(settings) for host, settings in HOST_SETTINGS.items()}
+    if os.path.exists(HOSTS_FILE):
+        try:
+            with open(HOSTS_FILE, "r", encoding="utf-8") as f:
+                for host, settings in json.load(f).items():
+                    hosts.setdefault(host, {}).update(settings)
+        except Exception as e:
+            print(f"⚠ [HTTP] 호스트 설정 읽기 실패: {e}")
+    return hosts
+
+
+class HttpClient:
+    """실행 1회 동안 공유하는 curl 세션 - requests.Session 처럼 get/post 사용"""
+
+    def __init__(self, hosts=None):
+        self.hosts = hosts if hosts is not None else load_host_settings()
+        self.session = requests.Session(
+            http_version="v2",                                # TLS 면 ALPN 으로 h2, 안 되면 1.1
+            curl_options={CurlOpt.DNS_CACHE_TIMEOUT: -1},     # DNS 결과를 세션이 끝날 때까지 보관
+            curl_infos=CURL_INFOS,
+        )
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def settings(self, url):
+        host = urlsplit(url).hostname or ""
+        settings = dict(DEFAULT_SETTINGS)
+        settings.update(self.hosts.get(host, {}))
+        return host, settings
+
+    def _record(self, host, response=None, failed=False):
+        infos = response.infos if response is not None else {}
+        connects = infos.get(CurlInfo.NUM_CONNECTS, 0)
+        with self.lock:
+            stat = self.stats.setdefault(host, {"requests": 0, "connects": 0, "connect_time": 0.0,
+                                                "dns_time": 0.0, "errors": 0, "versions": set()})
+            stat["requests"] += 1
+            stat["errors"] += 1 if failed else 0
+            if response is not None:
+                stat["versions"].add(HTTP_VERSIONS.get(response.http_version, str(response.http_version)))
+            if connects:
+                # TLS 면 핸드셰이크 끝난 시각(APPCONNECT), 평문이면 TCP 연결 시각
+                stat["connects"] += connects
+                stat["connect_time"] += infos.get(CurlInfo.APPCONNECT_TIME) or infos.get(CurlInfo.CONNECT_TIME, 0.0)
+                stat["dns_time"] += infos.get(CurlInfo.NAMELOOKUP_TIME, 0.0)
+
+    def request(self, method, url, **kwargs):
+        """호스트 설정을 기본값으로 채워서 요청 (GET 만 5xx 재시도)"""
+        host, settings = self.settings(url)
+        if settings["impersonate"]:
+            kwargs.setdefault("impersonate", settings["impersonate"])
+        kwargs.setdefault("verify", settings["verify"])
+        retries = settings["retries"] if method.upper() == "GET" else 0
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except Exception:
+                self._record(host, failed=True)
+                raise
+            self._record(host, response)
+            if response.status_code in RETRY_STATUS and attempt < retries:
+                print(f"  ⏳ [{host} {response.status_code}] {2 ** attempt}초 후 재시도 ({attempt + 1}/{retries})")
+                if kwargs.get("stream"):
+                    response.close()
+                time.sleep(2 ** attempt)
+                continue
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def report(self, bot):
+        """호스트별 요청/새 연결(핸드셰이크) 수와 연결 시간 출력 (+ GitHub Actions 요약)"""
+        with self.lock:
+            stats = sorted(self.stats.items())
+        if not stats:
+            return stats
+        lines = []
+        for host, stat in stats:
+            versions = ",".join(sorted(stat["versions"])) or "-"
+            errors = f" / 실패 {stat['errors']}회" if stat["errors"] else ""
+            lines.append(f"{host}: 요청 {stat['requests']}회 / 새 연결 {stat['connects']}회 "
+                         f"(연결 {stat['connect_time']:.2f}초, DNS {stat['dns_time']:.2f}초) / {versions}{errors}")
+        print(f"🔌 [HTTP] {bot} 호스트별 연결")
+        for line in lines:
+            print(f"  - {line}")
+        summary = os.environ.get("GITHUB_STEP_SUMMARY")
+        if summary:
+            with open(summary, "a", encoding="utf-8") as f:
+                for line in lines:
+                    f.write(f"- 🔌 {bot} {line}\n")
+        return stats
+
+
+# ===[외부 진입점]===
+def get_client():
+    """프로세스 안에서 하나만 만드는 공용 클라이언트"""
+    global _client
+    with _client_guard:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def get(url, **kwargs):
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_client().post(url, **kwargs)
+
+
+def report(bot):
+    """실행 종료 시 호출 (요청이 하나도 없었으면 출력 X)"""
+    if _client is not None:
+        _client.report(bot)
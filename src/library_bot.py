@@ -1,16 +1,20 @@
-import requests
 from bs4 import BeautifulSoup
 import os
 import time
-import json
 import re
 import urllib3
 import traceback 
 import random
+from collections import Counter
 from fake_useragent import UserAgent
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from dotenv import load_dotenv
+from discord_render import build_notice_payloads
+from profiler import run_profiled
+from outbox import start_delivery, finish_delivery
+from run_budget import RunBudget
+from notice_core import Notice, NoticePipeline
+import http_client
+from http_client import get_client
 load_dotenv()
 
 # ==========================================
@@ -24,8 +28,12 @@ MONITOR_WEBHOOK_URL = os.environ.get("MONITOR_WEBHOOK_URL")
 # DISCORD_WEBHOOK_URL = "https://discord.com/api/webhooks/..."
 # MONITOR_WEBHOOK_URL = "https://discord.com/api/webhooks/..."
 URL = "https://library.cnu.ac.kr/bbs/list/1"
+# 게시판은 1개 (기준 ID 는 상태 파일의 "last_id" 에 저장)
+BOARDS = [{"id": "general", "name": "도서관 일반공지", "url": URL, "state_key": "last_id"}]
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_FILE = os.path.join(BASE_DIR, "..", "data", "library_data.json")
+# 셀렉터 감시: (적중, 분모) - 줄 → 링크 → 제목칸 링크 / 글 ID
+CANARY_RATIOS = [("anchors", "rows"), ("title_anchors", "anchors"), ("ids", "anchors")]
 # ==========================================
 
 # ===[랜덤 헤더 생성기]===
@@ -42,13 +50,8 @@ def get_random_headers():
 
 # ===[세션 생성기]===
 def get_session():
-    """Retry 가능한 세션 생성"""
-    session = requests.Session()
-    retry = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
-    return session
+    """공용 HTTP 클라이언트 (연결/DNS/TLS 세션 재사용, verify·5xx 재시도는 http_client 의 호스트 설정)"""
+    return get_client()
 
 # ===[ID 추출기]===
 def extract_id_from_link(link):
@@ -65,30 +68,10 @@ def extract_id_from_link(link):
     return 0
 
 # ===[디코 전송기]===
-def send_discord_message(new_notices):
-    """학생용 공지 알림 전송"""
-    if not new_notices: return
-
-    if not DISCORD_WEBHOOK_URL:
-        print("⚠ 웹후크 URL이 없음")
-        send_simple_error_log("웹후크 URL이 없음")
-        return
-
-    count = len(new_notices)
-    message_content = f"### :books: [일반공지] 새 글 {count}건\n\n"
-    
-    for notice in new_notices:
-        title = notice['title']
-        link = notice['link']
-        icon = "▶" if notice['is_top'] else "▷"
-        message_content += f"{icon} [{title}](<{link}>)\n"
-
-    try:
-        requests.post(DISCORD_WEBHOOK_URL, json={"content": message_content})
-        print(f"✉ [전송 완료] 도서관 공지 {count}건")
-    except Exception as e:
-        send_simple_error_log("공지 전송 실패")
-        print(f"⚠ [전송 실패] {e}")
+def render_message(new_notices):
+    """전송할 payload 리스트 생성 (2000자/embed 한도 자동 분할)"""
+    header = f"### :books: [일반공지] 새 글 {len(new_notices)}건\n\n"
+    return build_notice_payloads(header, new_notices)
 
 # 관리자 심플 알림 함수
 def send_simple_error_log(error_msg=None):
@@ -106,55 +89,40 @@ def send_simple_error_log(error_msg=None):
         content = f"🚨 **[도서관 봇 오류]** \n{now}"
     
     try:
-        requests.post(MONITOR_WEBHOOK_URL, json={"content": content}, timeout=5)
+        http_client.post(MONITOR_WEBHOOK_URL, json={"content": content}, timeout=5)
         print("✉ [관리자 알림 전송 완료]")
     except:
         print("⚠ 관리자 알림 전송 실패")
 
-# ===[MAIN]===
-def check_library_notices():
-    print("\n" + "━" * 40)
-    print(f"🤖 도서관 공지봇 실행: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+# ===[목록 읽기]===
+def scan_library(session, budget):
+    """도서관 목록 접속 → (공지 iterator, 셀렉터 적중 수)"""
+    sleep_time = random.uniform(2, 5)
+    print(f"⏳ 도서관 접속 전 {sleep_time:.1f}초 대기...")
+    budget.sleep(sleep_time)
     
-    try:
-        # 1. 기존 데이터 파일 읽기
-        saved_data = {}
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                try: saved_data = json.load(f)
-                except: saved_data = {}
-        
-        last_id = saved_data.get("last_id", 0)
-
-        # 2. 웹페이지 접속
-        session = get_session()
-        sleep_time = random.uniform(2, 5)
-        print(f"⏳ 도서관 접속 전 {sleep_time:.1f}초 대기...")
-        time.sleep(sleep_time)
-        
-        # 랜덤 헤더 생성해서 넣기
-        current_headers = get_random_headers()
-        response = session.get(URL, headers=current_headers, verify=False, timeout=30)
-        
-        response.encoding = 'utf-8'
+    # 랜덤 헤더 생성해서 넣기
+    current_headers = get_random_headers()
+    response = session.get(URL, headers=current_headers, timeout=budget.timeout(30))
+    response.encoding = 'utf-8'
 
-        # 3. HTML 파싱
-        soup = BeautifulSoup(response.text, 'html.parser')
+    # HTML 파싱 → 게시글 줄(Row) 탐색
+    soup = BeautifulSoup(response.text, 'html.parser')
+    rows = soup.select('tbody > tr')
+    hits = Counter()
 
-        # 4. 게시글 줄(Row) 탐색
-        rows = soup.select('tbody > tr')
-        if not rows:
-            # 게시글을 못 찾은 것도 에러 상황일 수 있으므로 예외 발생
-            send_simple_error_log("게시글(tr)을 찾을 수 없음")
-            raise Exception("⚠ [도서관 일반공지] 게시글(tr)을 찾을 수 없음 (HTML 구조 변경 의심)")
-
-        new_notices = []
-        max_id_in_this_scan = last_id
-
-        # 5. 각 줄 반복 검사
+    def notices():
         for row in rows:
-            a_tag = row.select_one('td.title a') or row.select_one('td.subject a') or row.select_one('a')
+            # 기준 ID 에서 중단하므로 줄 수도 읽은 만큼만 집계 (적중률 유지)
+            hits["rows"] += 1
+            a_tag = row.select_one('td.title a') or row.select_one('td.subject a')
+            if a_tag:
+                hits["title_anchors"] += 1
+            else:
+                # 예비용 (아무 링크) - 적중률로 구조 변경 감시
+                a_tag = row.select_one('a')
             if not a_tag: continue
+            hits["anchors"] += 1
 
             title = a_tag.get('title') or a_tag.text.strip()
             title = title.replace("새글", "").strip()
@@ -164,36 +132,32 @@ def check_library_notices():
             
             article_id = extract_id_from_link(link)
             if article_id == 0: continue
+            hits["ids"] += 1
 
             is_top = 'always' in row.get('class', [])
+            yield Notice(article_id, title, link, is_top)
 
-            if article_id > last_id:
-                new_notices.append({
-                    "id": article_id,
-                    "title": title,
-                    "link": link,
-                    "is_top": is_top
-                })
-                if article_id > max_id_in_this_scan:
-                    max_id_in_this_scan = article_id
-
-        # 6. 최초 실행 처리
-        if last_id == 0 and max_id_in_this_scan > 0:
-            print(f"☐ [도서관] 최초 실행 - 기준점(ID: {max_id_in_this_scan})만 설정")
-            with open(DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump({"last_id": max_id_in_this_scan}, f, indent=4)
-            return
-
-        # 7. 새 글 전송 및 저장
-        if new_notices:
-            new_notices.sort(key=lambda x: x['id'])
-            send_discord_message(new_notices)
-            
-            with open(DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump({"last_id": max_id_in_this_scan}, f, indent=4)
-            print("☑ 도서관 데이터 저장 완료")
-        else:
-            print("☒ 도서관 새 소식 없음")
+    return notices(), hits
+
+# ===[MAIN]===
+def check_library_notices():
+    print("\n" + "━" * 40)
+    print(f"🤖 도서관 공지봇 실행: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # 실행 전체 시간 예산 (대기/timeout 을 남은 시간 안으로)
+    budget = RunBudget("library")
+    
+    try:
+        # 지난 실행에서 못 보낸 알림은 접속하는 동안 백그라운드로 전송
+        start_delivery("library", DISCORD_WEBHOOK_URL, send_simple_error_log)
+
+        session = get_session()
+        # 다른 게시판(학과/기숙사)에 이미 올라온 공지는 표시만, 이 채널로 보낸 건 제외
+        pipeline = NoticePipeline(
+            "library", DATA_FILE, DISCORD_WEBHOOK_URL, lambda name, notices: render_message(notices),
+            CANARY_RATIOS, budget, alert=send_simple_error_log, digest_title="도서관 공지"
+        )
+        pipeline.run(BOARDS, lambda board, last_id: scan_library(session, budget))
 
     # 에러 발생 시 처리
     except Exception as e:
@@ -201,6 +165,14 @@ def check_library_notices():
         traceback.print_exc()
         send_simple_error_log(f"프로그램 강제 종료\n{str(e)}") # 상세 에러 내용 전송
 
+    finally:
+        # 남은 알림 전송을 기다린 뒤 outbox 깊이 보고
+        finish_delivery("library", budget.final_timeout(60))
+        # 호스트별 새 연결(핸드셰이크) 수 / 연결 시간
+        http_client.report("library")
+        budget.finish()
+
 if __name__ == "__main__":
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    check_library_notices()
+    # --profile: 실행 전체 프로파일 기록
+    run_profiled("library", check_library_notices)
@@ -0,0 +1,126 @@
+import codecs
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup
+
+# ===[스트리밍 목록 파서]===
+# 응답 본문을 청크 단위로 읽어 증분 토크나이저(HTMLParser)에 넣고,
+# 완성된 <tr> 줄부터 바로 돌려준다 → 호출 측에서 기준 ID에 닿으면 읽기 중단
+CHUNK_SIZE = 8192
+
+
+class _RowSplitter(HTMLParser):
+    """목록 table의 tbody 안 <tr>...</tr> 원문을 모아 완성될 때마다 rows에 추가"""
+
+    def __init__(self, table_class=None):
+        super().__init__(convert_charrefs=False)
+        self.table_class = table_class
+        self.rows = []          # 완성된 줄(HTML 문자열)
+        self.table_depth = 0    # 대상 table 안에서의 table 중첩 깊이
+        self.in_body = False
+        self.buf = None         # 작성 중인 줄
+        self.inner_tables = 0   # 줄 안에 중첩된 table 수
+
+    def _is_target_table(self, attrs):
+        if not self.table_class:
+            return True
+        classes = (dict(attrs).get("class") or "").split()
+        return self.table_class in classes
+
+    def _close_row(self):
+        if self.buf is not None:
+            self.rows.append("".join(self.buf) + "</tr>")
+            self.buf = None
+            self.inner_tables = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            if self.table_depth == 0:
+                if not self._is_target_table(attrs):
+                    return
+            elif self.buf is not None:
+                self.inner_tables += 1
+            self.table_depth += 1
+        elif self.table_depth == 0:
+            return
+        elif tag == "tbody" and self.buf is None:
+            self.in_body = True
+            return
+        elif tag == "tr" and self.in_body and self.inner_tables == 0:
+            # </tr> 없이 다음 줄이 시작되는 경우도 처리
+            self._close_row()
+            self.buf = []
+        if self.buf is not None:
+            self.buf.append(self.get_starttag_text())
+
+    def handle_startendtag(self, tag, attrs):
+        if self.buf is not None:
+            self.buf.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if self.table_depth == 0:
+            return
+        if tag == "tr" and self.buf is not None and self.inner_tables == 0:
+            self._close_row()
+            return
+        if tag == "tbody" and self.buf is None:
+            self.in_body = False
+            return
+        if tag == "table":
+            if self.buf is not None and self.inner_tables > 0:
+                self.inner_tables -= 1
+            elif self.table_depth == 1:
+                self._close_row()
+                self.in_body = False
+            self.table_depth -= 1
+        if self.buf is not None:
+            self.buf.append(f"</{tag}>")
+
+    def handle_data(self, data):
+        if self.buf is not None:
+            self.buf.append(data)
+
+    def handle_entityref(self, name):
+        if self.buf is not None:
+            self.buf.append(f"&{name};")
+
+    def handle_charref(self, name):
+        if self.buf is not None:
+            self.buf.append(f"&#{name};")
+
+    def pop_rows(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+
+def iter_rows(response, table_class=None, stats=None, chunk_size=CHUNK_SIZE):
+    """
+    응답(stream=True)을 청크 단위로 읽으며 목록의 <tr>을 BeautifulSoup 태그로 하나씩 반환.
+    반복을 멈추면 나머지 본문은 읽지 않고 연결을 닫는다.
+    stats(dict)를 넘기면 읽은 바이트/줄 수를 기록.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    splitter = _RowSplitter(table_class)
+    if stats is not None:
+        stats.update({"bytes": 0, "rows": 0, "complete": False})
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            if stats is not None:
+                stats["bytes"] += len(chunk)
+            splitter.feed(decoder.decode(chunk))
+            for row_html in splitter.pop_rows():
+                if stats is not None:
+                    stats["rows"] += 1
+                yield BeautifulSoup(row_html, "html.parser").tr
+        splitter.feed(decoder.decode(b"", final=True))
+        splitter.close()
+        splitter._close_row()
+        for row_html in splitter.pop_rows():
+            if stats is not None:
+                stats["rows"] += 1
+            yield BeautifulSoup(row_html, "html.parser").tr
+        if stats is not None:
+            stats["complete"] = True
+    finally:
+        response.close()
@@ -0,0 +1,218 @@
+from collections.abc import Mapping
+from state_store import load_state, save_state
+from selector_canary import check_selectors
+from attachment_mirror import mirror_attachments
+from digest import is_digest_board, add_to_digest, flush_digest
+from profiler import profile_span
+from dedupe_index import collapse_duplicates
+from feed_writer import write_feeds
+from outbox import enqueue
+
+# ===[공통 공지 모델 + 처리 흐름]===
+# 모든 봇이 같은 순서로 처리: 가져오기(fetch) → 파싱(parse) → 새 글 골라내기(diff) → 렌더링 → 전송(dispatch)
+# 봇마다 다른 부분은 "게시판 1개를 읽어 공지를 목록 순서대로 내놓는 함수(scan)"와 렌더링 함수뿐
+
+
+class ScanDeferred(Exception):
+    """기준 글에 닿기 전에 시간 예산이 모자라 스캔을 멈춤 → 이번 실행은 기준 ID 를 그대로 둠"""
+
+
+# ===[공지 1건]===
+class Notice(Mapping):
+    """
+    공지 1건 - __slots__ 로 필드를 고정해 dict 보다 작게 (대량 백필/검색 색인용)
+      id: int (게시판 글 번호) 또는 str (WITH encSddpbSeq)
+      title: str / link: str / is_top: bool (상단 고정글)
+      extra: dict 또는 None (WITH 의 d_day/sub_items 처럼 봇별 추가 필드)
+    notice["title"], notice.get("also"), dict(notice) 처럼 dict 로도 읽을 수 있음
+    """
+    __slots__ = ("id", "title", "link", "is_top", "extra")
+    FIELDS = ("id", "title", "link", "is_top")
+
+    def __init__(self, id, title, link, is_top=False, extra=None):
+        self.id = id
+        self.title = title
+        self.link = link
+        self.is_top = is_top
+        self.extra = extra or None
+
+    def __getitem__(self, key):
+        if key in Notice.FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from Notice.FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return len(Notice.FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def __repr__(self):
+        return f"Notice({self.id!r}, {self.title!r})"
+
+    def __reduce__(self):
+        # 프로세스 풀(dept_bot)로 넘길 때
+        return (Notice, (self.id, self.title, self.link, self.is_top, self.extra))
+
+
+# ===[새 글 골라내기]===
+def diff_notices(notices, last_id, numeric=True):
+    """
+    목록 순서(최신 먼저)로 훑어서 (새 글 리스트, 새 기준 ID) 반환
+    - numeric: ID가 커질수록 최신 → last_id 이하인 고정글 아닌 글에서 중단, 새 글은 ID 오름차순
+    - numeric=False (WITH): ID 순서를 알 수 없음 → last_id 와 같은 글에서 중단, 목록 순서 유지
+    notices 가 지연 iterator 면 중단 지점 이후는 가져오지도 파싱하지도 않음
+    """
+    new_notices = []
+    newest = last_id
+    for index, notice in enumerate(notices):
+        if numeric:
+            if notice.id <= last_id:
+                if notice.is_top:
+                    continue
+                break
+            newest = max(newest, notice.id)
+        else:
+            if index == 0:
+                newest = notice.id     # 목록 맨 위 글이 새 기준점
+            if notice.id == last_id:
+                break
+        new_notices.append(notice)
+    # 지연 iterator(스트리밍 응답/페이지 넘김)는 여기서 바로 정리
+    if hasattr(notices, "close"):
+        notices.close()
+    if numeric:
+        new_notices.sort(key=lambda n: n.id)
+    return new_notices, newest
+
+
+# ===[처리 흐름]===
+class NoticePipeline:
+    """
+    봇 1개의 fetch → parse → diff → render → dispatch
+    boards: [{"id", "name", ("key", "state_key", "numeric", "priority")}]
+      key: 게시판 key (기본 "<봇>:<id>") - 셀렉터 감시/모아보기/중복 감지/피드에서 사용
+      state_key: 상태 파일에서 기준 ID 를 저장하는 key (기본 id)
+    """
+
+    def __init__(self, bot, data_file, webhook_url, render, canary_ratios, budget,
+                 alert=None, digest_title=None, mirror=None, compact=False):
+        self.bot = bot
+        self.data_file = data_file
+        self.webhook_url = webhook_url
+        self.render = render                  # render(게시판 이름, 공지 리스트) → payload 리스트
+        self.canary_ratios = canary_ratios
+        self.budget = budget
+        self.alert = alert
+        self.digest_title = digest_title
+        self.mirror = mirror                  # (session_factory, request_kwargs) - 첨부파일 보관
+        self.compact = compact
+        self.newest_first = set()             # 새 글이 목록 순서(최신 먼저)로 남는 게시판 key (numeric=False)
+
+    def board_key(self, board):
+        return board.get("key") or f"{self.bot}:{board['id']}"
+
+    def check(self, board, scan, saved_data, pending):
+        """게시판 1개: scan(board, last_id) → (공지 iterator, 적중 Counter) 를 받아 새 글 판단"""
+        state_key = board.get("state_key", board["id"])
+        last_id = saved_data.get(state_key, 0 if board.get("numeric", True) else None)
+        try:
+            notices, hits = scan(board, last_id)
+            new_notices, newest = diff_notices(notices, last_id, board.get("numeric", True))
+        except ScanDeferred as e:
+            # 여기서 기준 ID 를 올리면 미룬 페이지의 글은 영영 알림 X → 다음 실행에 처음부터 다시
+            print(f"⏭ [{board['name']}] {e} - 기준 ID 유지, 다음 실행에 다시 확인")
+            return False
+        except Exception as e:
+            print(f"⚠ [{board['name']}] 에러: {e}")
+            if self.alert:
+                self.alert(f"[{board['name']}] 접속 실패\n{str(e)}")
+            return False
+
+        # 셀렉터 적중률이 평소와 다르면(HTML 구조 변경 의심) 이번 스캔은 건너뜀
+        if check_selectors(self.board_key(board), hits, self.canary_ratios, self.alert):
+            return False
+
+        if not last_id and newest:
+            print(f"☐ [{board['name']}] 최초 실행 - 기준점(ID: {newest})만 설정, 전송 X")
+            saved_data[state_key] = newest
+            return True
+        if new_notices:
+            # 전송은 모든 게시판을 본 뒤 중복을 합쳐서 한 번에
+            pending.append((self.board_key(board), board["name"], new_notices))
+            if not board.get("numeric", True):
+                self.newest_first.add(self.board_key(board))
+            saved_data[state_key] = newest
+            return True
+        return False
+
+    def dispatch(self, pending):
+        """피드 → 게시판 간 중복 합치기 → 모아보기 버퍼 또는 outbox, outbox 에 못 넣은 게시판 key 집합 반환"""
+        # 피드는 게시판별로 빠짐없이 (중복 합치기 전 목록), 오래된 글부터 넘겨야 발행 시각 순서가 맞음
+        write_feeds([(board_key, board_name, notices[::-1] if board_key in self.newest_first else notices)
+                     for board_key, board_name, notices in pending])
+        collapsed = collapse_duplicates(self.bot, pending)
+        failed = set()
+        for board_key, board_name, notices in collapsed:
+            if is_digest_board(board_key):
+                add_to_digest(self.bot, board_key, board_name, notices)
+            elif not enqueue(self.bot, self.webhook_url, f"{board_name} - {len(notices)}건",
+                             self.render(board_name, notices)):
+                failed.add(board_key)
+        if failed:
+            # 다른 게시판 알림에 합쳐져 사라진 게시판도 그 알림이 실패했을 수 있음 → 함께 실패 처리
+            failed |= {board_key for board_key, _, _ in pending} - {board_key for board_key, _, _ in collapsed}
+            if self.alert:
+                self.alert(f"웹후크 URL이 없음 - 알림 {len(failed)}개 게시판 기준 ID 유지")
+        return failed
+
+    def run(self, boards, scan):
+        """전체 게시판 처리 → 상태 저장 → 첨부 보관 → 모아보기 주기 전송, 새 글 batches 반환"""
+        # 파일 읽기 (손상 시 백업 복구, 복구 불가면 StateCorruptError 로 중단)
+        saved_data = load_state(self.data_file)
+        pending = []
+        any_changes = False
+        previous = {}      # 게시판 key → (state_key, 이전 기준 ID) - outbox 에 못 넣으면 되돌림
+
+        # 지난번에 밀린 게시판 → 우선순위 순
+        for board in self.budget.plan(boards):
+            if not self.budget.admit(board):
+                continue
+            state_key = board.get("state_key", board["id"])
+            previous[self.board_key(board)] = (state_key, saved_data.get(state_key))
+            with profile_span(board["id"]):
+                if self.check(board, scan, saved_data, pending):
+                    any_changes = True
+            self.budget.done(board)
+
+        with profile_span("dispatch"):
+            failed = self.dispatch(pending)
+
+        # outbox 에 기록되지 않은 알림의 기준 ID 는 올리지 않음 (다음 실행에 다시 감지)
+        for board_key in failed:
+            state_key, last_id = previous[board_key]
+            if last_id is None:
+                saved_data.pop(state_key, None)
+            else:
+                saved_data[state_key] = last_id
+
+        # 알림이 outbox 에 기록된 뒤에 기준 ID 저장
+        if any_changes:
+            save_state(self.data_file, saved_data, compact=self.compact)
+            print("☑ 데이터 저장 완료")
+        else:
+            print("☒ 변동 사항 없음")
+
+        # (선택) 첨부파일 보관 - 남은 실행 시간 안에서만 (remaining 은 outbox 전송용 여유를 뺀 값)
+        if self.mirror:
+            for board_key, _, notices in pending:
+                mirror_attachments(board_key, notices, *self.mirror, time_limit=self.budget.remaining())
+
+        # 모아보기 주기가 됐으면 전송
+        if self.digest_title:
+            flush_digest(self.bot, self.webhook_url, self.digest_title)
+        return pending
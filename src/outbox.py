@@ -0,0 +1,217 @@
+import os
+import time
+import uuid
+import hashlib
+import threading
+from discord_render import post_payloads
+from state_store import load_state, update_state
+
+# ===[전송 대기열(outbox)]===
+# 알림을 바로 보내지 않고 먼저 data/outbox_data.json 에 기록한 뒤 상태(기준 ID)를 저장
+#   → 전송이 실패해도 메시지는 파일에 남아서 다음 실행에 다시 전송 (기준 ID만 넘어가는 일 X)
+# 실제 전송은 백그라운드 스레드가 담당 (수집과 동시에 지난 실행의 남은 메시지부터 전송)
+#   { 봇: { 메시지 ID: {channel, label, payloads, done, created, attempts, sent | dropped} } }
+# 같은 채널 안에서는 순서 유지: 앞 메시지가 재시도 중이면 뒤 메시지도 기다림 (429 외 4xx 는 바로 포기)
+# 웹후크 URL 은 파일에 저장하지 않고 해시(channel)만 기록 → 실행할 때 봇이 URL 을 다시 등록
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTBOX_FILE = os.path.join(BASE_DIR, "..", "data", "outbox_data.json")
+
+FLUSH_TIMEOUT = float(os.environ.get("OUTBOX_FLUSH_TIMEOUT", 60))   # 종료 전 남은 메시지 전송 대기(초)
+RUN_ATTEMPTS = 3          # 한 번 실행에서 메시지당 최대 시도 수 (넘으면 다음 실행으로)
+RETRY_DELAY = 5           # 실행 중 재시도 간격(초, 시도마다 2배)
+MAX_ATTEMPTS = 10         # 여러 실행에 걸쳐 이만큼 실패하면 포기 (잘못된 payload 가 채널을 막지 않도록)
+SENT_KEEP = 2 * 86400     # 전송 완료 기록 보관 기간 (git 병합 때 되살아나지 않도록 잠시 남김)
+
+_webhooks = {}            # channel → 웹후크 URL (이번 실행에서 등록된 것만)
+_workers = {}             # 봇 → 전송 스레드
+_workers_guard = threading.Lock()
+
+
+def _channel(webhook_url):
+    return hashlib.sha256(webhook_url.encode("utf-8")).hexdigest()[:12]
+
+
+def _finished(item):
+    return item.get("sent") or item.get("dropped")
+
+
+def _prune(items):
+    cutoff = time.time() - SENT_KEEP
+    for msg_id in [k for k, item in items.items() if _finished(item) and _finished(item) < cutoff]:
+        del items[msg_id]
+
+
+def pending_count(bot):
+    """아직 전송되지 않은 메시지 수"""
+    return sum(1 for item in load_state(OUTBOX_FILE).get(bot, {}).values() if not _finished(item))
+
+
+# ===[전송 스레드]===
+class _Worker(threading.Thread):
+    """outbox 를 오래된 메시지부터 비우는 스레드 (실패한 메시지는 간격을 두고 재시도)"""
+
+    def __init__(self, bot, alert=None):
+        super().__init__(daemon=True)
+        self.bot = bot
+        self.alert = alert
+        self.wake = threading.Event()
+        self.closing = False
+        self.stopped = False
+        self.failures = {}     # 메시지 ID → 이번 실행 실패 횟수
+        self.retry_at = {}     # 메시지 ID → 다음 시도 시각
+        self.sent = 0
+
+    def _due(self):
+        """(지금 보낼 메시지, 가장 빠른 재시도 시각) - 채널마다 가장 오래된 미전송 메시지만 후보"""
+        items = load_state(OUTBOX_FILE).get(self.bot, {})
+        now = time.monotonic()
+        due, waiting, seen = None, [], set()
+        for msg_id, item in sorted(items.items(), key=lambda kv: (kv[1]["created"], kv[0])):
+            if _finished(item) or item["channel"] not in _webhooks or item["channel"] in seen:
+                continue
+            seen.add(item["channel"])
+            if self.failures.get(msg_id, 0) >= RUN_ATTEMPTS:
+                continue
+            if self.retry_at.get(msg_id, 0) > now:
+                waiting.append(self.retry_at[msg_id])
+                continue
+            due = due or (msg_id, item)
+        return due, min(waiting) if waiting else None
+
+    def _mark(self, msg_id, **changes):
+        def update(data):
+            item = data.get(self.bot, {}).get(msg_id)
+            if item:
+                item.update(changes)
+        update_state(OUTBOX_FILE, update, strict=True)
+
+    def _deliver(self, msg_id, item):
+        webhook_url = _webhooks[item["channel"]]
+        done = item.get("done", 0)
+        try:
+            # payload 하나마다 진행 상황 기록 → 중간에 실패해도 보낸 부분은 다시 안 보냄
+            for index in range(done, len(item["payloads"])):
+                post_payloads(webhook_url, [item["payloads"][index]], timeout=10)
+                done = index + 1
+                self._mark(msg_id, done=done)
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status and 400 <= status < 500 and status != 429:
+                # 잘못된 payload/삭제된 웹후크 등 → 다시 보내도 실패, 뒤 메시지를 막지 않도록 바로 포기
+                self._mark(msg_id, attempts=item.get("attempts", 0) + 1, dropped=time.time())
+                print(f"⚠ [전송 포기] {item['label']} - 디스코드 {status} 응답: {e}")
+                if self.alert:
+                    self.alert(f"공지 전송 포기 (디스코드 {status} 응답)\n{item['label']}: {e}")
+                return
+            failures = self.failures.get(msg_id, 0) + 1
+            self.failures[msg_id] = failures
+            self.retry_at[msg_id] = time.monotonic() + RETRY_DELAY * 2 ** (failures - 1)
+            attempts = item.get("attempts", 0) + 1
+            if attempts >= MAX_ATTEMPTS:
+                self._mark(msg_id, attempts=attempts, dropped=time.time())
+                print(f"⚠ [전송 포기] {item['label']} - {attempts}회 실패: {e}")
+                if self.alert:
+                    self.alert(f"공지 전송 포기 ({attempts}회 실패)\n{item['label']}: {e}")
+                return
+            self._mark(msg_id, attempts=attempts)
+            later = "다음 실행에 재시도" if failures >= RUN_ATTEMPTS else f"{failures}/{RUN_ATTEMPTS}"
+            print(f"⚠ [전송 실패] {item['label']} - {e} ({later})")
+            if failures >= RUN_ATTEMPTS and self.alert:
+                self.alert(f"공지 전송 실패 - outbox 에 보관, 다음 실행에 재시도\n{item['label']}: {e}")
+            return
+        self._mark(msg_id, sent=time.time())
+        self.sent += 1
+        print(f"✉ [전송 완료] {item['label']} ({len(item['payloads'])}회 전송)")
+
+    def run(self):
+        while not self.stopped:
+            try:
+                due, next_retry = self._due()
+            except Exception as e:
+                print(f"⚠ [outbox] 읽기 실패: {e}")
+                return
+            if due:
+                try:
+                    self._deliver(*due)
+                except Exception as e:
+                    # outbox 기록 실패(파일 손상 등) → 더 보내면 중복 위험, 정지
+                    print(f"⚠ [outbox] 기록 실패: {e}")
+                    return
+                continue
+            if self.closing and next_retry is None:
+                return
+            self.wake.wait(None if next_retry is None else max(0.0, next_retry - time.monotonic()))
+            self.wake.clear()
+
+
+def _worker(bot, alert=None):
+    with _workers_guard:
+        worker = _workers.get(bot)
+        if worker is None:
+            worker = _workers[bot] = _Worker(bot, alert)
+            worker.start()
+        return worker
+
+
+# ===[외부 진입점]===
+def start_delivery(bot, webhook_url, alert=None):
+    """
+    실행 시작 시 호출: 웹후크 등록 + 지난 실행에서 못 보낸 메시지부터 전송 시작
+    alert: 이번 실행에서 끝내 못 보낸 메시지가 생기면 호출할 함수 (관리자 알림)
+    """
+    if not webhook_url:
+        return
+    _webhooks[_channel(webhook_url)] = webhook_url
+    _worker(bot, alert).wake.set()
+
+
+def enqueue(bot, webhook_url, label, payloads):
+    """메시지를 outbox 에 기록 (디스크에 저장된 뒤 반환) → 백그라운드 전송"""
+    if not payloads:
+        return None
+    if not webhook_url:
+        print("⚠ 웹후크 URL이 없음")
+        return None
+    channel = _channel(webhook_url)
+    _webhooks[channel] = webhook_url
+    msg_id = uuid.uuid4().hex[:12]
+
+    def update(data):
+        items = data.setdefault(bot, {})
+        _prune(items)
+        items[msg_id] = {"channel": channel, "label": label, "payloads": payloads,
+                         "done": 0, "created": time.time(), "attempts": 0}
+
+    update_state(OUTBOX_FILE, update, strict=True)
+    _worker(bot).wake.set()
+    return msg_id
+
+
+def finish_delivery(bot, timeout=FLUSH_TIMEOUT):
+    """실행 종료 시 호출: 남은 메시지 전송을 기다린 뒤 outbox 깊이 보고, 남은 수 반환"""
+    worker = _workers.get(bot)
+    if worker is not None:
+        worker.closing = True
+        worker.wake.set()
+        worker.join(timeout)
+        if worker.is_alive():
+            # 시간 초과 → 지금 보내는 payload 까지만 마치고 정지
+            worker.stopped = True
+            worker.wake.set()
+            print(f"⚠ [outbox] {timeout:.0f}초 안에 다 보내지 못함 - 나머지는 다음 실행에 전송")
+            worker.join(15)
+        with _workers_guard:
+            _workers.pop(bot, None)
+
+    try:
+        depth = pending_count(bot)
+    except Exception as e:
+        print(f"⚠ [outbox] 읽기 실패: {e}")
+        return None
+    sent = worker.sent if worker else 0
+    print(f"📮 [outbox] 이번 실행 전송 {sent}건 / 남은 메시지 {depth}건")
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        with open(summary, "a", encoding="utf-8") as f:
+            f.write(f"- 📮 {bot} outbox: 전송 {sent}건, 남은 메시지 {depth}건\n")
+    return depth
@@ -0,0 +1,134 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# ===[실행 프로파일러]===
+# python src/cse_bot.py --profile 처럼 실행하면 전체 실행을 샘플링해서
+#  - profile/<봇>-<시각>.collapsed : flamegraph.pl / speedscope 에 바로 넣을 수 있는 collapsed stack
+#  - 구간(게시판/페이지)별로 대기(sleep) / 네트워크 / 파싱 / WebDriver / 기타 시간 요약 출력
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILE_DIR = os.path.join(BASE_DIR, "..", "profile")
+INTERVAL = 0.005     # 샘플링 간격(초)
+
+CATEGORIES = ("sleep", "network", "parsing", "webdriver", "other")
+_CATEGORY_PATHS = (
+    ("webdriver", ("selenium", "webdriver_manager")),
+    ("parsing", ("bs4", "soupsieve", os.path.join("html", "parser.py"), "list_stream.py", "_markupbase")),
+    ("network", ("requests", "urllib3", "curl_cffi", os.path.join("http", "client.py"), "socket.py", "ssl.py")),
+)
+
+_spans = ["run"]          # 현재 구간 스택 (메인 스레드)
+_real_sleep = time.sleep
+
+
+@contextmanager
+def profile_span(name):
+    """게시판/페이지 단위 구간 표시 (프로파일링을 안 할 때는 거의 비용 없음)"""
+    _spans.append(name)
+    try:
+        yield
+    finally:
+        _spans.pop()
+
+
+def mark_span(name):
+    """순서대로 진행되는 단계(로그인 → 페이지1 → ...)용: 현재 최상위 구간을 교체"""
+    del _spans[1:]
+    _spans.append(name)
+
+
+def _profiled_sleep(seconds):
+    # 샘플러가 스택에서 이 함수를 보고 "sleep"으로 분류
+    _real_sleep(seconds)
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _classify(frames):
+    """WebDriver 호출 안이면 webdriver, 아니면 안쪽 프레임부터 보며 첫 번째로 걸리는 분류"""
+    webdriver_paths = _CATEGORY_PATHS[0][1]
+    if any(marker in f.f_code.co_filename for f in frames for marker in webdriver_paths):
+        return "webdriver"
+    for frame in reversed(frames):
+        if frame.f_code.co_name == "_profiled_sleep":
+            return "sleep"
+        filename = frame.f_code.co_filename
+        for category, markers in _CATEGORY_PATHS[1:]:
+            if any(marker in filename for marker in markers):
+                return category
+    return "other"
+
+
+class _Sampler(threading.Thread):
+    """메인 스레드 스택을 주기적으로 찍어 collapsed stack / 분류별 시간 집계"""
+
+    def __init__(self, target_ident):
+        super().__init__(daemon=True)
+        self.target_ident = target_ident
+        self.stop_event = threading.Event()
+        self.stacks = Counter()
+        self.category_time = defaultdict(Counter)   # 구간 → 분류 → 초
+
+    def run(self):
+        last = time.perf_counter()
+        while not self.stop_event.is_set():
+            _real_sleep(INTERVAL)
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frame = sys._current_frames().get(self.target_ident)
+            if frame is None:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(frame)
+                frame = frame.f_back
+            frames.reverse()
+            span = ";".join(_spans)
+            self.stacks[span + ";" + ";".join(_frame_name(f) for f in frames)] += 1
+            self.category_time[_spans[-1]][_classify(frames)] += elapsed
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+def _report(name, sampler, wall):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.collapsed")
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in sorted(sampler.stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+    print("\n" + "━" * 40)
+    print(f"⏱ [프로파일] {name} 전체 {wall:.2f}초 / 샘플 {sum(sampler.stacks.values())}개")
+    print(f"{'구간':<24}" + "".join(f"{c:>11}" for c in CATEGORIES))
+    totals = Counter()
+    for span, times in sampler.category_time.items():
+        totals.update(times)
+        print(f"{span[:24]:<24}" + "".join(f"{times[c]:>10.2f}s" for c in CATEGORIES))
+    print(f"{'(합계)':<24}" + "".join(f"{totals[c]:>10.2f}s" for c in CATEGORIES))
+    print(f"☑ collapsed stack 저장: {os.path.relpath(path)} (flamegraph.pl / speedscope)")
+    return path
+
+
+def run_profiled(name, func, *args, **kwargs):
+    """--profile 인자가 있으면 프로파일링하며 실행, 없으면 그냥 실행"""
+    if "--profile" not in sys.argv:
+        return func(*args, **kwargs)
+
+    sampler = _Sampler(threading.get_ident())
+    time.sleep = _profiled_sleep
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        sampler.stop()
+        time.sleep = _real_sleep
+        _report(name, sampler, time.perf_counter() - started)
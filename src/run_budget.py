@@ -0,0 +1,114 @@
+import os
+import time
+from state_store import load_state, update_state
+
+# ===[실행 시간 예산]===
+# 봇 1회 실행에 쓸 수 있는 전체 시간을 정해두고
+#  - 게시판은 (지난번에 밀린 게시판 → priority 낮은 숫자 → 원래 순서) 로 확인
+#  - 요청 timeout / 대기 시간은 남은 시간 안으로 줄임
+#  - 남은 시간이 그 게시판의 평소 소요 시간보다 적으면 다음 실행으로 미룸 (data/schedule_data.json 에 기록)
+#  - priority 0 게시판(학사공지/입주 공지 등)과 지난번에 밀린 게시판은 시간이 조금이라도 남아 있으면 확인
+#  - 일정 파일은 미룬 게시판이 바뀌거나 소요 시간이 크게 달라졌을 때만 다시 씀 (작은 변동으로 매번 커밋 X)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEDULE_FILE = os.path.join(BASE_DIR, "..", "data", "schedule_data.json")
+
+RUN_BUDGET = float(os.environ.get("RUN_BUDGET_SECONDS", 180))   # 봇 1회 실행 전체 예산(초)
+RESERVE = 20            # 전송/저장용으로 남겨둘 시간(초)
+MIN_TIMEOUT = 3         # 이보다 짧은 timeout 으로는 요청하지 않음
+DEFAULT_PRIORITY = 1
+DEFAULT_COST = 15       # 처음 보는 게시판의 예상 소요 시간(초)
+COST_STEP = 3           # 저장된 소요 시간과 이만큼(초) 이상 & 20% 이상 달라져야 다시 기록 (매 실행 커밋 방지)
+
+
+class RunBudget:
+    """봇 1회 실행의 시간 예산 + 게시판 확인 순서/미루기 관리"""
+
+    def __init__(self, bot, seconds=RUN_BUDGET):
+        self.bot = bot
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.deadline = self.started + seconds
+        try:
+            saved = load_state(SCHEDULE_FILE).get(bot, {})
+        except Exception as e:
+            print(f"⚠ [예산] 일정 파일 읽기 실패: {e}")
+            saved = {}
+        self.carried = saved.get("deferred", [])     # 지난 실행에서 밀린 게시판
+        self.saved_costs = dict(saved.get("cost", {}))
+        self.costs = dict(self.saved_costs)          # 게시판별 평소 소요 시간(초)
+        self.deferred = []
+        self.board_started = {}
+
+    # ---[시간 계산]---
+    def remaining(self):
+        """전송/저장용 시간을 뺀 남은 시간(초)"""
+        return self.deadline - time.monotonic() - RESERVE
+
+    def timeout(self, default):
+        """요청 timeout: 기본값과 남은 시간 중 짧은 쪽 (최소 MIN_TIMEOUT)"""
+        return max(MIN_TIMEOUT, min(default, self.remaining()))
+
+    def sleep(self, seconds):
+        """예의상 대기도 남은 시간 안에서만"""
+        time.sleep(max(0.0, min(seconds, self.remaining())))
+
+    def final_timeout(self, default):
+        """종료 직전 작업(남은 알림 전송 등): 전체 마감까지 남은 시간 안에서"""
+        return max(MIN_TIMEOUT, min(default, self.deadline - time.monotonic()))
+
+    # ---[게시판 순서/미루기]---
+    def plan(self, boards):
+        """지난번에 밀린 게시판 먼저, 그다음 priority 순 (같으면 원래 순서)"""
+        return sorted(boards, key=lambda b: (b["id"] not in self.carried, b.get("priority", DEFAULT_PRIORITY)))
+
+    def admit(self, board):
+        """이 게시판을 지금 확인할지 결정 (안 하면 다음 실행으로 미룸)"""
+        remaining = self.remaining()
+        # 두 번 연속 밀리지 않도록 지난번에 밀린 게시판도 필수
+        must_run = board.get("priority", DEFAULT_PRIORITY) == 0 or board["id"] in self.carried
+        if remaining >= self.costs.get(board["id"], DEFAULT_COST) or (must_run and remaining >= MIN_TIMEOUT):
+            self.board_started[board["id"]] = time.monotonic()
+            return True
+        self.deferred.append(board["id"])
+        print(f"⏭ [{board['name']}] 남은 시간 {max(0, remaining):.0f}초 - 다음 실행으로 미룸")
+        return False
+
+    def done(self, board):
+        """게시판 소요 시간 기록 (평소 값에 천천히 반영)"""
+        started = self.board_started.pop(board["id"], None)
+        if started is None:
+            return
+        elapsed = time.monotonic() - started
+        previous = self.costs.get(board["id"])
+        cost = elapsed if previous is None else previous * 0.7 + elapsed * 0.3
+        self.costs[board["id"]] = cost
+
+    def changed_costs(self):
+        """저장할 소요 시간: 크게 달라진 게시판만 정수 초로 갱신, 나머지는 저장된 값 그대로"""
+        costs = dict(self.saved_costs)
+        for board_id, cost in self.costs.items():
+            previous = self.saved_costs.get(board_id)
+            if previous is None or abs(cost - previous) >= max(COST_STEP, previous * 0.2):
+                costs[board_id] = max(1, round(cost))
+        return costs
+
+    # ---[마무리]---
+    def finish(self):
+        """미룬 게시판/소요 시간 저장 + 요약 출력"""
+        used = time.monotonic() - self.started
+        deferred, costs = self.deferred, self.changed_costs()
+
+        def update(data):
+            bot_data = data.setdefault(self.bot, {})
+            bot_data["deferred"] = deferred
+            bot_data["cost"] = costs
+
+        # 바뀐 게 없으면 파일을 건드리지 않음 → 워크플로우가 커밋할 변경도 없음
+        if deferred != self.carried or costs != self.saved_costs:
+            try:
+                update_state(SCHEDULE_FILE, update)
+            except Exception as e:
+                print(f"⚠ [예산] 일정 저장 실패: {e}")
+        note = f", 미룬 게시판 {len(deferred)}개: {', '.join(deferred)}" if deferred else ""
+        print(f"⏱ [예산] {self.seconds:.0f}초 중 {used:.1f}초 사용{note}")
+        return deferred
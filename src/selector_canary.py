@@ -0,0 +1,75 @@
+import os
+from state_store import update_state
+
+# ===[셀렉터 상태 감시]===
+# 스캔마다 셀렉터별 적중 수(줄/제목 링크/ID 등)를 세고,
+# 게시판별로 저장된 기준 적중률(이동 평균)과 비교해 HTML 구조 변경을 조기에 감지
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CANARY_FILE = os.path.join(BASE_DIR, "..", "data", "canary_data.json")
+
+WINDOW = 10          # 이동 평균에 반영하는 최근 스캔 수
+MIN_SAMPLES = 3      # 이 횟수 이상 쌓인 뒤부터 비율 비교
+DROP_RATIO = 0.5     # 기준 적중률의 절반 미만이면 이상으로 판단
+
+
+def _diagnose(board, counts, ratios):
+    """기준과 비교한 이상 사유 목록"""
+    reasons = []
+    base_key = ratios[0][1]
+    if counts.get(base_key, 0) == 0:
+        reasons.append(f"'{base_key}' 0건 (목록 셀렉터 불일치)")
+        return reasons
+    for hit, total in ratios:
+        if not counts.get(total):
+            continue
+        rate = counts.get(hit, 0) / counts[total]
+        baseline = board.get("rates", {}).get(f"{hit}/{total}")
+        if not baseline or baseline["n"] < MIN_SAMPLES:
+            continue
+        if rate < baseline["mean"] * DROP_RATIO:
+            reasons.append(f"{hit}/{total} 적중률 {rate:.0%} (평소 {baseline['mean']:.0%})")
+    return reasons
+
+
+def _learn(board, counts, ratios):
+    """정상 스캔만 기준에 반영 (소수점 3자리 이동 평균 → 평소엔 파일 변화 없음)"""
+    rates = board.setdefault("rates", {})
+    for hit, total in ratios:
+        if not counts.get(total):
+            continue
+        rate = counts.get(hit, 0) / counts[total]
+        entry = rates.setdefault(f"{hit}/{total}", {"mean": rate, "n": 0})
+        n = min(entry["n"] + 1, WINDOW)
+        entry["mean"] = round(entry["mean"] + (rate - entry["mean"]) / n, 3)
+        entry["n"] = n
+
+
+def check_selectors(board_key, counts, ratios, alert=None):
+    """
+    적중 수를 기준과 비교하고 이상 사유 목록을 반환 (빈 리스트 = 정상).
+    ratios: [(적중 key, 분모 key), ...] - 첫 분모는 0건이면 바로 이상 처리.
+    이상이 새로 생겼을 때만 alert(메시지)를 1번 호출.
+    """
+    def update(data):
+        board = data.setdefault(board_key, {})
+        reasons = _diagnose(board, counts, ratios)
+        newly_broken = bool(reasons) and not board.get("drift")
+        if reasons:
+            board["drift"] = True
+        else:
+            board.pop("drift", None)
+            _learn(board, counts, ratios)
+        return reasons, newly_broken
+
+    try:
+        reasons, newly_broken = update_state(CANARY_FILE, update)
+    except Exception as e:
+        print(f"⚠ [셀렉터 감시] 기록 실패: {e}")
+        return []
+
+    summary = ", ".join(f"{k} {v}" for k, v in counts.items())
+    if reasons:
+        print(f"⚠ [{board_key}] HTML 구조 변경 의심 → 이번 스캔 건너뜀 ({summary})")
+        if newly_broken and alert:
+            alert(f"[{board_key}] HTML 구조 변경 의심\n" + "\n".join(reasons) + f"\n적중 수: {summary}")
+    return reasons
@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows 로컬 테스트용 (잠금 없이 동작)
+    fcntl = None
+
+# ===[상태 파일 저장소]===
+# - 봇마다 파일 1개(data/*_data.json), 그 안에서 게시판 key 단위로 병합
+# - 임시 파일 작성 → fsync → 원자적 rename (중간에 죽어도 반쪽 파일 X)
+# - 파일 잠금 + 디스크 내용과 병합(max/합집합) → 동시 실행해도 덮어쓰기 X
+# - 깨진 파일은 .bak 로 복구, 둘 다 깨지면 예외 (절대 "최초 실행"으로 초기화 X)
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+class StateCorruptError(Exception):
+    """상태 파일이 깨져서 복구할 수 없음"""
+
+
+def _thread_lock(path):
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(os.path.abspath(path), threading.RLock())
+
+
+class FileLock:
+    """같은 프로세스(스레드) + 다른 프로세스 모두에 대한 잠금"""
+
+    def __init__(self, path, exclusive=True):
+        self.path = path
+        self.exclusive = exclusive
+        self.lock = _thread_lock(path)
+        self.fd = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        if fcntl:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self.fd, fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+        return self
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+        self.lock.release()
+
+
+# ===[병합 규칙]===
+def merge_values(old, new):
+    """숫자는 max, 리스트는 합집합(순서 유지), dict는 key별 재귀, 그 외는 새 값"""
+    if isinstance(old, bool) or isinstance(new, bool):
+        return new
+    if isinstance(old, (int, float)) and isinstance(new, (int, float)):
+        return max(old, new)
+    if isinstance(old, list) and isinstance(new, list):
+        merged = list(old)
+        for value in new:
+            if value not in merged:
+                merged.append(value)
+        return merged
+    if isinstance(old, dict) and isinstance(new, dict):
+        merged = dict(old)
+        for key, value in new.items():
+            merged[key] = merge_values(old[key], value) if key in old else value
+        return merged
+    return new
+
+
+# ===[읽기]===
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_unlocked(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        return _read_json(path)
+    except (ValueError, OSError) as e:
+        backup = path + ".bak"
+        if os.path.exists(backup):
+            try:
+                print(f"⚠ 상태 파일 손상 → 백업에서 복구: {os.path.basename(path)}")
+                return _read_json(backup)
+            except (ValueError, OSError):
+                pass
+        raise StateCorruptError(f"상태 파일 손상: {path} ({e})")
+
+
+def load_state(path):
+    """상태 파일 읽기 (없으면 {}, 깨졌으면 백업 사용, 둘 다 깨지면 StateCorruptError)"""
+    with FileLock(path, exclusive=False):
+        return _read_unlocked(path)
+
+
+# ===[쓰기]===
+def atomic_write(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    # rename 자체도 디스크에 반영
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _dump(data, compact=False):
+    if compact:
+        return json.dumps(data, ensure_ascii=False)
+    return json.dumps(data, ensure_ascii=False, indent=4)
+
+
+def save_state(path, data, merge=True, compact=False):
+    """디스크 내용과 병합 후 원자적으로 저장, 저장된 최종 데이터 반환"""
+    with FileLock(path):
+        if merge:
+            try:
+                current = _read_unlocked(path)
+            except StateCorruptError:
+                current = {}
+            data = merge_values(current, data)
+        if os.path.exists(path):
+            # 직전 정상본을 백업으로 보관
+            try:
+                _read_json(path)
+                with open(path, "r", encoding="utf-8") as f:
+                    atomic_write(path + ".bak", f.read())
+            except (ValueError, OSError):
+                pass
+        atomic_write(path, _dump(data, compact))
+        return data
+
+
+def update_state(path, update, compact=False, strict=False):
+    """
+    잠금을 잡은 채로 읽기 → update(data) → 저장 (max 병합이 맞지 않는 값용)
+    strict: 잃으면 안 되는 파일(outbox) - 저장 전 정상본을 .bak 로 보관, 깨졌으면 .bak 로 남기고 StateCorruptError
+    """
+    with FileLock(path):
+        try:
+            data = _read_unlocked(path)
+        except StateCorruptError:
+            if strict:
+                # 여기까지 왔으면 .bak 도 없거나 깨진 상태 → 손상본을 .bak 로 남겨 수동 복구 가능하게
+                with open(path, "rb") as f:
+                    corrupt = f.read()
+                with open(path + ".bak", "wb") as f:
+                    f.write(corrupt)
+                raise
+            data = {}
+        before = _dump(data, compact)
+        result = update(data)
+        after = _dump(data, compact)
+        if after != before:
+            if strict and os.path.exists(path):
+                atomic_write(path + ".bak", before)
+            atomic_write(path, after)
+        return result
+
+
+# ===[git merge driver]===
+# .gitattributes: data/*.json merge=bot-state
+# git config merge.bot-state.driver "python src/state_store.py merge %O %A %B"
+def git_merge(base_path, ours_path, theirs_path):
+    """git pull --rebase 충돌 시 양쪽 상태를 max/합집합으로 병합해 ours에 기록"""
+    try:
+        ours = _read_json(ours_path)
+        theirs = _read_json(theirs_path)
+    except (ValueError, OSError) as e:
+        print(f"⚠ 상태 병합 실패: {e}")
+        return 1
+    atomic_write(ours_path, _dump(merge_values(theirs, ours)))
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "merge":
+        sys.exit(git_merge(*sys.argv[2:]))
+    print("사용법: python src/state_store.py merge <base> <ours> <theirs>")
+    sys.exit(2)
@@ -1,14 +1,14 @@
 import os
 import time
-import json
-import requests
 import re
+import zlib
 import traceback
-from datetime import datetime
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 load_dotenv()
 import random
 import json as pyjson
+from collections import Counter
 
 # ===[셀레니움 관련 라이브러리]===
 from selenium import webdriver
@@ -19,8 +19,15 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from discord_render import build_payloads
+from state_store import load_state, update_state
+from profiler import run_profiled, mark_span
+from outbox import start_delivery, finish_delivery
+from run_budget import RunBudget
+from notice_core import Notice, NoticePipeline, ScanDeferred
+import http_client
+from http_client import get_client
+from attachment_mirror import ENABLED as MIRROR_ENABLED
 
 # ===[설정 영역]==========================
 USER_ID = os.environ.get("CNU_ID")
@@ -29,8 +36,19 @@ DISCORD_WEBHOOK_URL = os.environ.get("with_WEBHOOK_URL")
 MONITOR_WEBHOOK_URL = os.environ.get("MONITOR_WEBHOOK_URL")
 
 LIST_URL = "https://with.cnu.ac.kr/ptfol/imng/icmpNsbjtPgm/findIcmpNsbjtPgmList.do"
+# 목록 1개 - ID(encSddpbSeq) 는 순서를 알 수 없어 "마지막으로 읽은 글"에서 멈춤
+BOARDS = [{"id": "list", "key": "with", "name": "CNU With+ 비교과", "state_key": "last_read_id",
+           "numeric": False, "priority": 0}]
+# 목록 깊이 / 동시 탭 수 - 오래 멈췄다가 따라잡을 때는 깊이를 늘려도 탭 수만큼 한꺼번에 로딩
+PAGE_DEPTH = int(os.environ.get("WITH_PAGE_DEPTH", 3))   # 기준 글을 찾아 최대 몇 페이지까지 볼지
+PAGE_TABS = int(os.environ.get("WITH_PAGE_TABS", 3))     # 2페이지부터 동시에 여는 탭 수 (1이면 한 탭에서 차례로)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_FILE = os.path.join(BASE_DIR, "..", "data", "with_data.json")
+# 프로그램별 상세(반 목록/신청·운영 기간) 캐시 - 운영 기간이 끝나면 삭제
+DETAIL_CACHE_FILE = os.path.join(BASE_DIR, "..", "data", "with_detail_cache.json")
+DETAIL_CACHE_DAYS = 30   # 운영 기간을 모르는 프로그램의 보관 기간(일)
+# 셀렉터 감시: (적중, 분모) - 목록 → 제목 링크 → data-params / 상세 파싱 성공 / 멀티 반 세부 항목
+CANARY_RATIOS = [("anchors", "items"), ("params", "anchors"), ("parsed", "details"), ("sub_items", "multi")]
 # ==========================================
 
 def clean_text(text):
@@ -100,19 +118,45 @@ def extract_details(container):
     except: pass
     return data
 
-def post_to_discord_safe(content):
-    if not DISCORD_WEBHOOK_URL or "http" not in DISCORD_WEBHOOK_URL: return
-    session = requests.Session()
-    retry = Retry(connect=3, backoff_factor=1)
-    session.mount('http://', HTTPAdapter(max_retries=retry))
-    session.mount('https://', HTTPAdapter(max_retries=retry))
+# ===[상세 캐시]===
+# key: encSddpbSeq → {"fp": 제목+D-day+반 수 지문, "details": 파싱 결과, "expires": 삭제 시각}
+# 지문이 같으면 "더보기" 클릭 + 반별 파싱(extract_details)을 건너뜀
+def detail_fingerprint(title, d_day, sub_count):
+    return format(zlib.crc32(f"{title}|{d_day}|{sub_count}".encode("utf-8")), "08x")
+
+def detail_expires(details):
+    """운영 종료일 다음 날 0시 (종료일을 모르면 DETAIL_CACHE_DAYS 뒤)"""
+    raws = [s['oper_raw'] for s in details.get('sub_items', [])] or [details.get('oper_raw', '')]
+    ends = []
+    for raw in raws:
+        parts = [p.strip() for p in raw.split('~') if p.strip()]
+        # "2024.03.01 10:00 ~ 12:00" 처럼 끝이 시각만 있으면 시작 날짜 기준
+        dt = (parse_str_to_dt(parts[-1]) or parse_str_to_dt(parts[0])) if parts else None
+        if dt: ends.append(dt)
+    if not ends:
+        return time.time() + DETAIL_CACHE_DAYS * 86400
+    last_day = max(ends).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (last_day + timedelta(days=1)).timestamp()
+
+def load_detail_cache():
+    """운영이 끝난 프로그램은 빼고 읽기"""
     try:
-        # 멘션 없이 내용만 전송
-        session.post(DISCORD_WEBHOOK_URL, json={"content": content}, timeout=10)
-        print("✉ [전송 성공]")
+        cache = load_state(DETAIL_CACHE_FILE)
     except Exception as e:
-        send_simple_error_log("게시물 전송 실패")
-        print(f"⚠ [전송 실패] {e}")
+        print(f"⚠ [상세 캐시] 읽기 실패: {e}")
+        return {}
+    now = time.time()
+    return {pid: entry for pid, entry in cache.items() if entry.get("expires", 0) > now}
+
+def save_detail_cache(cache):
+    """병합(max/합집합) 대신 통째로 교체 - 반 목록이 섞이지 않도록"""
+    def update(data):
+        data.clear()
+        data.update(cache)
+    try:
+        update_state(DETAIL_CACHE_FILE, update, compact=True)
+    except Exception as e:
+        print(f"⚠ [상세 캐시] 저장 실패: {e}")
 
 # ===[메시지 디자인 수정 영역]===
 def create_message_content(info):
@@ -179,22 +223,13 @@ def create_message_content(info):
 
     return header + body_text + "\n"
 
-def send_batch_messages(new_items):
-    if not new_items: return
-    
-    count = len(new_items)
+def render_batch_messages(new_items):
+    """전송할 payload 리스트 생성 (오래된 글부터, 2000자 한도 자동 분할)"""
     # [메인 헤더]
-    full_message = f"### :compass: [CNU With+] 새로운 비교과 {count}건\n\n"
-    
-    for item in reversed(new_items):
-        content_chunk = create_message_content(item)
-        if len(full_message) + len(content_chunk) > 1900:
-            post_to_discord_safe(full_message)
-            full_message = ""
-        full_message += content_chunk
-
-    if full_message:
-        post_to_discord_safe(full_message)
+    header = f"### :compass: [CNU With+] 새로운 비교과 {len(new_items)}건\n\n"
+    blocks = [create_message_content(item) for item in reversed(new_items)]
+    # 인용문/<링크> 서식을 그대로 쓰기 위해 content 모드로 묶음
+    return build_payloads(header, blocks, mode="content")
 
 def send_simple_error_log(error_msg=None):
     if not MONITOR_WEBHOOK_URL: return 
@@ -211,16 +246,244 @@ def send_simple_error_log(error_msg=None):
         content = f"🚨 **[WITH(비교과) 봇 오류]** \n{now}"
     
     try:
-        requests.post(MONITOR_WEBHOOK_URL, json={"content": content}, timeout=5)
+        http_client.post(MONITOR_WEBHOOK_URL, json={"content": content}, timeout=5)
         print("✉ [관리자 알림 전송 완료]")
     except:
         print("⚠ 관리자 알림 전송 실패")
 
+def make_wait(driver, budget, default=20):
+    """남은 실행 시간 안에서만 기다리는 WebDriverWait"""
+    return WebDriverWait(driver, budget.timeout(default))
+
+def get_logged_in_session(driver):
+    """
+    셀레니움 로그인 쿠키를 공용 HTTP 클라이언트에 복사 → (클라이언트, 요청 옵션)
+    WebDriver 는 스레드 안전하지 않으므로 보관 스레드를 띄우기 전에 메인 스레드에서 1번만 호출
+    """
+    client = get_client()
+    for cookie in driver.get_cookies():
+        client.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain") or "")
+    # 웹후크 전송에는 영향 없도록 User-Agent 는 보관 요청에만
+    user_agent = driver.execute_script("return navigator.userAgent;")
+    return client, {"headers": {"User-Agent": user_agent}}
+
+# ===[목록 스캔]===
+def parse_program(driver, item, pid, a_tag, detail_cache, hits):
+    """목록의 li 1개 → Notice (멀티 반이면 펼쳐서 반별 상세까지, 캐시가 맞으면 생략)"""
+    link = f"https://with.cnu.ac.kr/ptfol/imng/icmpNsbjtPgm/findIcmpNsbjtPgmInfo.do?encSddpbSeq={pid}&paginationInfo.currentPageNo=1"
+    full_title = a_tag.get_attribute("textContent")
+    try: title = clean_text(full_title.replace(a_tag.find_element(By.CLASS_NAME, "label").get_attribute("textContent"), ""))
+    except: title = clean_text(full_title)
+    
+    try: d_day = clean_text(item.find_element(By.CSS_SELECTOR, "span.day").get_attribute("textContent"))
+    except: d_day = ""
+    
+    is_multi = "multi_class" in item.get_attribute("class")
+    p_data = {
+        "d_day": d_day, "is_multi": is_multi, "sub_items": [], "multi_calc": {},
+        "apply_raw": "", "oper_raw": "", "capacity": ""
+    }
+
+    # 상세 캐시: 제목/D-day/반 수가 그대로면 펼치기 + 파싱 생략
+    sub_count = len(item.find_elements(By.CLASS_NAME, "class_cont")) if is_multi else 0
+    fingerprint = detail_fingerprint(title, d_day, sub_count)
+    cached = detail_cache.get(pid)
+    if cached and cached["fp"] == fingerprint:
+        p_data.update(cached["details"])
+        hits["cached"] += 1
+        return Notice(pid, title, link, False, p_data)
+    hits["details"] += 1
+
+    try:
+        more = item.find_elements(By.CLASS_NAME, "class_more_open")
+        if more and more[0].is_displayed():
+            driver.execute_script("arguments[0].click();", more[0])
+            time.sleep(0.5)
+    except: pass
+
+    if is_multi:
+        hits["multi"] += 1
+        for sub in item.find_elements(By.CLASS_NAME, "class_cont"):
+            if not sub.get_attribute("textContent").strip(): continue
+            try:
+                s_title = sub.find_element(By.CSS_SELECTOR, "a.tit").get_attribute("textContent")
+                try: s_title = s_title.replace(sub.find_element(By.CLASS_NAME, "label").get_attribute("textContent"), "")
+                except: pass
+                p_data['sub_items'].append({"title": clean_text(s_title), **extract_details(sub)})
+            except: continue
+        hits["sub_items"] += len(p_data['sub_items'])
+        p_data['multi_calc'] = calculate_multi_info(p_data['sub_items'])
+    else:
+        p_data.update(extract_details(item))
+    hits["parsed"] += 1
+    # 캐시 저장 (셀렉터 감시는 실제로 파싱한 것만 집계)
+    keys = ("sub_items", "multi_calc") if is_multi else ("apply_raw", "oper_raw", "capacity")
+    details = {k: p_data[k] for k in keys}
+    detail_cache[pid] = {"fp": fingerprint, "details": details, "expires": detail_expires(details)}
+    return Notice(pid, title, link, False, p_data)
+
+def find_list_items(driver):
+    """현재 탭의 목록 li 들"""
+    items = driver.find_elements(By.CSS_SELECTOR, "li:has(div.cont_box)")
+    if not items: 
+        items = [li for li in driver.find_elements(By.CSS_SELECTOR, "li") if li.find_elements(By.CLASS_NAME, "cont_box")]
+    return items
+
+# 목록 첫 글의 data-params (페이지가 실제로 바뀌었는지 확인용)
+FIRST_ITEM_JS = "var a = document.querySelector('li a.tit[data-params]'); return a ? a.getAttribute('data-params') : null;"
+
+def first_item_params(driver):
+    try: return driver.execute_script(FIRST_ITEM_JS)
+    except: return None
+
+def wait_page_changed(driver, budget, before):
+    """global.page() 뒤 첫 글이 바뀔 때까지 대기 - 남아 있던 이전 목록을 읽으면 "목록 끝"으로 오판"""
+    try:
+        make_wait(driver, budget).until(lambda d: first_item_params(d) not in (None, before))
+        return True
+    except:
+        return False
+
+def open_page_tabs(driver, budget, pages):
+    """
+    pages 를 새 탭에서 동시에 불러오기 → ({페이지: 탭 handle}, {페이지: 이동 전 첫 글})
+    같은 브라우저 탭이라 로그인 쿠키를 그대로 공유, 페이지 이동은 기다리지 않고 한꺼번에 대기
+    """
+    main = driver.current_window_handle
+    tabs, firsts = {}, {}
+    for page in pages:
+        before = set(driver.window_handles)
+        driver.execute_script("window.open(arguments[0], '_blank');", LIST_URL)
+        tabs[page] = (set(driver.window_handles) - before).pop()
+    # 탭마다 목록이 뜨면 해당 페이지로 이동 (탭들이 동시에 로딩됨)
+    for page, handle in tabs.items():
+        driver.switch_to.window(handle)
+        make_wait(driver, budget).until(EC.presence_of_element_located((By.CSS_SELECTOR, "li div.cont_box")))
+        firsts[page] = first_item_params(driver)
+        driver.execute_script(f"global.page({page});")
+    driver.switch_to.window(main)
+    return tabs, firsts
+
+def close_page_tabs(driver, tabs, main):
+    """페이지 탭 닫고 원래 탭으로"""
+    if not tabs: return
+    for handle in tabs.values():
+        try:
+            driver.switch_to.window(handle)
+            driver.close()
+        except: pass
+    driver.switch_to.window(main)
+
+def scan_programs(driver, budget, last_read_id, detail_cache, hits):
+    """
+    목록을 최신 글부터 하나씩 내놓음 (지연 생성, 최대 PAGE_DEPTH 페이지)
+    1페이지는 기본 탭, 그 뒤는 PAGE_TABS 개씩 탭을 열어 동시에 불러온 뒤 페이지 순서대로 내놓음
+    기준 글에 닿으면 받는 쪽(diff)이 멈추므로 그 뒤 페이지는 열지 않음
+    기준 글 전에 시간 예산으로 페이지를 미루면 ScanDeferred (기준 ID 유지)
+    """
+    driver.get(LIST_URL)
+    budget.sleep(random.uniform(2, 4))
+    try: make_wait(driver, budget).until(EC.presence_of_element_located((By.CSS_SELECTOR, "li div.cont_box")))
+    except:
+        send_simple_error_log("목록 로딩 실패")
+        raise Exception("목록 로딩 실패")
+
+    main = driver.current_window_handle
+    # 최초 실행은 기준점(맨 위 글)만 필요 → 1페이지만
+    depth = PAGE_DEPTH if last_read_id else 1
+    seen = set()
+    tabs, firsts = {}, {}
+    page = 1
+    try:
+        while page <= depth:
+            # 이번 묶음: 1페이지(이미 열림) 또는 다음 PAGE_TABS 개 페이지
+            wave = [1] if page == 1 else list(range(page, min(depth, page + max(1, PAGE_TABS) - 1) + 1))
+            # 1페이지는 항상, 그 뒤 페이지는 평소 걸리는 시간만큼 남았을 때만
+            infos = []
+            for p in wave:
+                page_info = {"id": f"page{p}", "name": f"{p}페이지", "priority": 0 if p == 1 else 1}
+                if not budget.admit(page_info): break
+                infos.append(page_info)
+            pages = wave[:len(infos)]
+
+            if page > 1 and pages:
+                try:
+                    if len(pages) > 1:
+                        tabs, firsts = open_page_tabs(driver, budget, pages)
+                    else:
+                        firsts = {page: first_item_params(driver)}
+                        driver.execute_script(f"global.page({page});")
+                except Exception as e:
+                    # 중간에 멈춘 채 기준점을 올리지 않도록 실패로 처리
+                    raise Exception(f"[페이지 {page}~] 이동 실패: {e}")
+
+            for p, page_info in zip(pages, infos):
+                mark_span(f"page{p}")
+                print(f"☐ [페이지 {p}] 스캔 중...")
+                if p in tabs:
+                    driver.switch_to.window(tabs[p])
+                changed = p == 1 or wait_page_changed(driver, budget, firsts.get(p))
+
+                items = find_list_items(driver)
+                if items and not changed:
+                    # 이전 페이지 목록이 그대로 → 읽으면 "목록 끝"으로 오판해 기준점이 올라감, 실패로 처리
+                    raise Exception(f"[페이지 {p}] 목록이 바뀌지 않음 (페이지 이동 확인 실패)")
+                if not items:
+                    if p == 1:
+                        raise Exception(f"⚠ [{p}페이지] 게시글 목록(li)을 찾을 수 없음 (HTML 구조 변경 의심)")
+                    print(f"☑ [페이지 {p}] 목록 끝")
+                    return
+
+                fresh = 0
+                for item in items:
+                    hits["items"] += 1
+                    try:
+                        a_tag = item.find_element(By.CSS_SELECTOR, "a.tit")
+                        hits["anchors"] += 1
+                        pid = ""
+                        try:
+                            pid = pyjson.loads(a_tag.get_attribute("data-params")).get("encSddpbSeq")
+                        except: pass
+                        
+                        if not pid: continue
+                        hits["params"] += 1
+                        if pid in seen: continue
+                        seen.add(pid)
+                        fresh += 1
+                        if pid == last_read_id or not last_read_id:
+                            # 기준 글 / 최초 실행(기준점만 설정)은 상세를 읽지 않음
+                            notice = Notice(pid, "", "")
+                        else:
+                            notice = parse_program(driver, item, pid, a_tag, detail_cache, hits)
+                    except: continue
+                    yield notice
+                budget.done(page_info)
+                # 마지막 페이지를 넘기면 같은 목록이 다시 나옴
+                if not fresh and p > 1:
+                    print(f"☑ [페이지 {p}] 목록 끝")
+                    return
+
+            close_page_tabs(driver, tabs, main)
+            tabs = {}
+            if len(pages) < len(wave):
+                # 기준 글을 못 찾은 채 페이지를 미룸 → 여기까지만 보고 기준점을 올리면 미룬 페이지 글이 누락됨
+                raise ScanDeferred(f"{wave[len(pages)]}페이지부터 다음 실행으로 미룸")
+            page = pages[-1] + 1
+    finally:
+        # 기준 글에서 멈췄거나 에러가 나도 열어둔 탭은 정리
+        close_page_tabs(driver, tabs, main)
+
 def run_selenium_scraper():
     print("\n" + "━" * 40)
     print("🤖 WITH(비교과) 알람봇 실행")
 
+    # 실행 전체 시간 예산 (대기 시간/페이지 수를 남은 시간 안으로)
+    budget = RunBudget("with")
+
     try:
+        # 지난 실행에서 못 보낸 알림은 로그인/수집하는 동안 백그라운드로 전송
+        start_delivery("with", DISCORD_WEBHOOK_URL, send_simple_error_log)
+
         chrome_options = Options()
         chrome_options.add_argument("--headless")
         chrome_options.add_argument("--no-sandbox")
@@ -229,19 +492,20 @@ def run_selenium_scraper():
 
         service = Service(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=chrome_options)
-        wait = WebDriverWait(driver, 20)
+        driver.set_page_load_timeout(budget.timeout(60))
 
+        mark_span("login")
         print(f"☐ 로그인 페이지 접속...")
         driver.get("https://with.cnu.ac.kr/index.do")
         
         try:
-            login_btn = wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "login_btn")))
+            login_btn = make_wait(driver, budget).until(EC.element_to_be_clickable((By.CLASS_NAME, "login_btn")))
             driver.execute_script("arguments[0].click();", login_btn)
         except: pass
 
         try:
             try:
-                wait.until(EC.visibility_of_element_located((By.NAME, "userId"))).send_keys(USER_ID)
+                make_wait(driver, budget).until(EC.visibility_of_element_located((By.NAME, "userId"))).send_keys(USER_ID)
                 driver.find_element(By.NAME, "password").send_keys(USER_PW + Keys.RETURN)
             except:
                 found = False
@@ -260,112 +524,32 @@ def run_selenium_scraper():
                     raise Exception("로그인 폼 못 찾음")
             
             try:
-                wait.until(EC.invisibility_of_element_located((By.CLASS_NAME, "login_btn")))
+                make_wait(driver, budget).until(EC.invisibility_of_element_located((By.CLASS_NAME, "login_btn")))
                 print("☑ 로그인 성공")
             except:
                 send_simple_error_log("로그인 실패")
                 raise Exception("⚠ 로그인 실패 (로그인 버튼이 사라지지 않음)")
         except Exception as e: raise e
 
-        last_read_id = None
-        is_first = False
-        if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, "r", encoding="utf-8") as f:
-                    last_read_id = json.load(f).get("last_read_id")
-            except: pass
-        if not last_read_id: is_first = True
-
-        driver.get(LIST_URL)
-        time.sleep(random.uniform(2, 4))
-        try: wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "li div.cont_box")))
-        except:
-            send_simple_error_log("목록 로딩 실패")
-            raise Exception("목록 로딩 실패")
-
-        new_items = []
-        stop = False
-        top_id = None
-
-        for page in range(1, 4): 
-            if stop: break
-            print(f"☐ [페이지 {page}] 스캔 중...")
-            if page > 1:
-                try:
-                    driver.execute_script(f"global.page({page});")
-                    time.sleep(random.uniform(2, 4))
-                except: break
-            
-            items = driver.find_elements(By.CSS_SELECTOR, "li:has(div.cont_box)")
-            if not items: 
-                items = [li for li in driver.find_elements(By.CSS_SELECTOR, "li") if li.find_elements(By.CLASS_NAME, "cont_box")]
-            
-            if not items:
-                raise Exception(f"⚠ [{page}페이지] 게시글 목록(li)을 찾을 수 없음 (HTML 구조 변경 의심)")
-
-            for item in items:
-                try:
-                    a_tag = item.find_element(By.CSS_SELECTOR, "a.tit")
-                    pid = ""
-                    try:
-                        pid = pyjson.loads(a_tag.get_attribute("data-params")).get("encSddpbSeq")
-                    except: pass
-                    
-                    if not pid: continue
-                    if top_id is None: top_id = pid
-                    if pid == last_read_id:
-                        stop = True
-                        break
-                    if is_first: continue
-
-                    link = f"https://with.cnu.ac.kr/ptfol/imng/icmpNsbjtPgm/findIcmpNsbjtPgmInfo.do?encSddpbSeq={pid}&paginationInfo.currentPageNo=1"
-                    full_title = a_tag.get_attribute("textContent")
-                    try: title = clean_text(full_title.replace(a_tag.find_element(By.CLASS_NAME, "label").get_attribute("textContent"), ""))
-                    except: title = clean_text(full_title)
-                    
-                    try: d_day = clean_text(item.find_element(By.CSS_SELECTOR, "span.day").get_attribute("textContent"))
-                    except: d_day = ""
-                    
-                    is_multi = "multi_class" in item.get_attribute("class")
-                    p_data = {
-                        "id": pid, "title": title, "d_day": d_day, "link": link,
-                        "is_multi": is_multi, "sub_items": [], "multi_calc": {},
-                        "apply_raw": "", "oper_raw": "", "capacity": ""
-                    }
+        # (선택) 첨부파일 보관 - 로그인 쿠키를 옮긴 클라이언트로 상세 페이지 접근 (보관 스레드는 driver 를 건드리지 않음)
+        mirror = None
+        if MIRROR_ENABLED:
+            mirror_client, mirror_kwargs = get_logged_in_session(driver)
+            mirror = (lambda: mirror_client, mirror_kwargs)
+
+        # 목록 스캔 → 새 글 골라내기 → 전송 → 기준점 저장 (공통 처리 흐름)
+        detail_cache = load_detail_cache()
+        hits = Counter()
+        pipeline = NoticePipeline(
+            "with", DATA_FILE, DISCORD_WEBHOOK_URL, lambda name, items: render_batch_messages(items),
+            CANARY_RATIOS, budget, alert=send_simple_error_log, digest_title="CNU With+",
+            mirror=mirror, compact=True
+        )
+        pipeline.run(BOARDS, lambda board, last_id: (scan_programs(driver, budget, last_id, detail_cache, hits), hits))
 
-                    try:
-                        more = item.find_elements(By.CLASS_NAME, "class_more_open")
-                        if more and more[0].is_displayed():
-                            driver.execute_script("arguments[0].click();", more[0])
-                            time.sleep(0.5)
-                    except: pass
-
-                    if is_multi:
-                        for sub in item.find_elements(By.CLASS_NAME, "class_cont"):
-                            if not sub.get_attribute("textContent").strip(): continue
-                            try:
-                                s_title = sub.find_element(By.CSS_SELECTOR, "a.tit").get_attribute("textContent")
-                                try: s_title = s_title.replace(sub.find_element(By.CLASS_NAME, "label").get_attribute("textContent"), "")
-                                except: pass
-                                p_data['sub_items'].append({"title": clean_text(s_title), **extract_details(sub)})
-                            except: continue
-                        p_data['multi_calc'] = calculate_multi_info(p_data['sub_items'])
-                    else:
-                        p_data.update(extract_details(item))
-                    new_items.append(p_data)
-                except: continue
-        
-        if is_first:
-            if top_id:
-                with open(DATA_FILE, "w", encoding="utf-8") as f: json.dump({"last_read_id": top_id}, f)
-            print("☐ 최초 실행 - 기준점 설정 완료")
-        elif new_items:
-            print(f"● {len(new_items)}개 새 글 -> 묶음 전송")
-            send_batch_messages(new_items)
-            if top_id:
-                with open(DATA_FILE, "w", encoding="utf-8") as f: json.dump({"last_read_id": top_id}, f)
-        else:
-            print("☒ 새 글 없음")
+        if hits["cached"]:
+            print(f"☑ [상세 캐시] {hits['cached']}개 프로그램 펼치기/파싱 생략")
+        save_detail_cache(detail_cache)
 
     except Exception as e:
         print(f"⚠ 에러: {e}")
@@ -374,6 +558,12 @@ def run_selenium_scraper():
         send_simple_error_log(f"프로그램 강제 종료\n{str(e)}")
     finally:
         if 'driver' in locals(): driver.quit()
+        # 남은 알림 전송을 기다린 뒤 outbox 깊이 보고
+        finish_delivery("with", budget.final_timeout(60))
+        # 호스트별 새 연결(핸드셰이크) 수 / 연결 시간
+        http_client.report("with")
+        budget.finish()
 
 if __name__ == "__main__":
-    run_selenium_scraper()
\ No newline at end of file
+    # --profile: 로그인/페이지별 프로파일 기록
+    run_profiled("with", run_selenium_scraper)
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 봇 스크립트들은 src/ 에서 서로를 바로 import 하므로 테스트도 같은 경로로
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,50 @@
+from discord_render import (
+    pack_content, pack_embeds, CONTENT_LIMIT, EMBED_DESC_LIMIT, EMBEDS_PER_MESSAGE, EMBED_TOTAL_LIMIT,
+)
+
+
+def embed_chars(payload):
+    return sum(len(e.get("title", "")) + len(e["description"]) for e in payload["embeds"])
+
+
+def test_pack_content_splits_at_2000_chars_in_order():
+    blocks = [f"▷ 공지 {i:03d} " + "가" * 90 + "\n" for i in range(60)]
+    payloads = pack_content("### 헤더\n\n", blocks)
+
+    assert len(payloads) > 1
+    assert all(len(p["content"]) <= CONTENT_LIMIT for p in payloads)
+    joined = "".join(p["content"] for p in payloads)
+    assert joined == "### 헤더\n\n" + "".join(blocks)
+
+
+def test_pack_content_truncates_oversized_block():
+    payloads = pack_content("", ["가" * 3000])
+    assert len(payloads) == 1
+    assert len(payloads[0]["content"]) == CONTENT_LIMIT
+    assert payloads[0]["content"].endswith("…")
+
+
+def test_pack_embeds_respects_desc_total_and_count_limits():
+    # 블록 1개 1000자 → embed 1개에 4개(4000자), 메시지 1건에 6000자까지
+    blocks = [f"{i:04d}" + "나" * 995 + "\n" for i in range(40)]
+    payloads = pack_embeds("제목", blocks)
+
+    for payload in payloads:
+        assert len(payload["embeds"]) <= EMBEDS_PER_MESSAGE
+        assert embed_chars(payload) <= EMBED_TOTAL_LIMIT
+        assert all(len(e["description"]) <= EMBED_DESC_LIMIT for e in payload["embeds"])
+    joined = "".join(e["description"] for p in payloads for e in p["embeds"])
+    assert joined == "".join(blocks)
+    # 제목은 첫 embed 에만
+    titles = [e.get("title") for p in payloads for e in p["embeds"]]
+    assert titles[0] == "제목" and not any(titles[1:])
+
+
+def test_pack_embeds_full_blocks_one_per_embed():
+    # 4096자 블록 → embed 1개씩, 6000자 합계 한도 때문에 메시지도 1건씩 (embed 10개 한도와 함께 확인)
+    blocks = ["다" * EMBED_DESC_LIMIT for _ in range(EMBEDS_PER_MESSAGE + 3)]
+    payloads = pack_embeds("", blocks)
+
+    assert all(len(p["embeds"]) <= EMBEDS_PER_MESSAGE for p in payloads)
+    assert all(embed_chars(p) <= EMBED_TOTAL_LIMIT for p in payloads)
+    assert sum(len(p["embeds"]) for p in payloads) == len(blocks)
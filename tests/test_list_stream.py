@@ -0,0 +1,116 @@
+import pytest
+from bs4 import BeautifulSoup
+
+import cse_bot
+from list_stream import iter_rows
+from notice_core import diff_notices
+
+
+# ===[가짜 응답 (stream=True)]===
+class FakeResponse:
+    """body 를 chunk 바이트씩 내주고, 실제로 내준 바이트 수와 close 여부를 기록"""
+
+    def __init__(self, html, chunk=None):
+        self.body = html.encode("utf-8")
+        self.chunk = chunk
+        self.sent = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        size = self.chunk or chunk_size
+        for start in range(0, len(self.body), size):
+            piece = self.body[start:start + size]
+            self.sent += len(piece)
+            yield piece
+
+    def close(self):
+        self.closed = True
+
+
+def row(article_no, title, top=False):
+    cls = ' class="b-top-box"' if top else ""
+    return (f'<tr{cls}><td class="b-num-box">{article_no}</td>'
+            f'<td><div class="b-title-box"><a href="?mode=view&amp;articleNo={article_no}" '
+            f'title="{title} 자세히 보기">{title}</a></div></td></tr>\n')
+
+
+def page(rows):
+    return ('<html><body><table class="search"><tbody><tr><td>검색</td></tr></tbody></table>'
+            '<table class="board-table"><thead><tr><th>번호</th></tr></thead><tbody>\n'
+            + "".join(rows) + '</tbody></table><div class="footer">' + "x" * 5000 + "</div></body></html>")
+
+
+# 줄 안의 중첩 table / 엔티티 / 한글(멀티바이트가 청크 경계에 걸림) 포함
+ROWS = [row(3, "공지 &amp; 안내", top=True)] + [
+    row(100, "학사 &lt;일정&gt; &#39;변경&#39; &#x2F;"),
+    '<tr><td>표<table class="inner"><tbody><tr><td>안쪽</td></tr></tbody></table>뒤</td><td>끝</td></tr>\n',
+    '<tr><td><br/><img src="a.png"/>이미지</td></tr>\n',
+] + [row(n, f"글 {n}") for n in range(99, 90, -1)]
+
+CHUNK_SIZES = [1, 2, 3, 7, 64, 8192]
+
+
+def reference(html):
+    # 목록 table 의 직속 줄만 (중첩 table 의 줄은 그 줄 안에 포함)
+    return [str(tr) for tr in BeautifulSoup(html, "html.parser").select("table.board-table > tbody > tr")]
+
+
+# ===[테스트]===
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_rows_match_soup_select(chunk_size):
+    html = page(ROWS)
+    stats = {}
+    rows = [str(tr) for tr in iter_rows(FakeResponse(html), "board-table", stats, chunk_size=chunk_size)]
+    assert rows == reference(html)
+    assert stats == {"bytes": len(html.encode("utf-8")), "rows": len(ROWS), "complete": True}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_missing_tr_end_tag(chunk_size):
+    # </tr> 없이 다음 <tr> 이 시작돼도 줄이 나뉨 (html.parser 는 중첩으로 읽으므로 닫힌 문서와 비교)
+    html = page(ROWS)
+    unclosed = page([r.replace("</tr>\n", "") if i % 2 else r for i, r in enumerate(ROWS)])
+    rows = [str(tr) for tr in iter_rows(FakeResponse(unclosed), "board-table", chunk_size=chunk_size)]
+    assert rows == reference(html)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_early_close_stops_reading(chunk_size):
+    response = FakeResponse(page(ROWS))
+    rows = iter_rows(response, "board-table", chunk_size=chunk_size)
+    first = next(rows)
+    rows.close()
+    assert "articleNo=3" in str(first)
+    assert response.closed
+    # 첫 줄이 든 청크까지만 읽음 (나머지 줄/꼬리는 읽지 않음)
+    stop = response.body.index(b"articleNo=100")
+    assert response.sent <= min(len(response.body), stop + chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_cse_scan_stops_at_stored_id(chunk_size):
+    # 고정글(기준 ID 이하)은 건너뛰고, 고정글 아닌 첫 기준 ID 이하 줄에서 읽기 중단
+    html = page([row(50, "오래된 고정", top=True)] + [row(n, f"글 {n}") for n in range(120, 0, -1)])
+    response = FakeResponse(html, chunk_size)
+
+    class Session:
+        def get(self, url, **kwargs):
+            return response
+
+    class Budget:
+        def sleep(self, seconds):
+            pass
+
+        def timeout(self, default):
+            return default
+
+    board = {"id": "notice", "name": "공지", "url": "https://computer.cnu.ac.kr/notice"}
+    notices, hits = cse_bot.scan_board(Session(), board, Budget())
+    new, newest = diff_notices(notices, 115, numeric=True)
+
+    assert [n.id for n in new] == [116, 117, 118, 119, 120]
+    assert newest == 120
+    assert response.closed
+    # 기준 ID 줄(115)이 든 청크 + 토크나이저가 붙잡고 있는 꼬리 정도만 읽음
+    stop = html.encode("utf-8").index(b"articleNo=114")
+    assert response.sent <= stop + chunk_size
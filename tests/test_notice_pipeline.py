@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+import notice_core
+from notice_core import Notice, NoticePipeline
+
+
+# ===[가짜 예산 / 외부 기록 (파일·웹후크 없이)]===
+class FakeBudget:
+    def plan(self, boards):
+        return list(boards)
+
+    def admit(self, board):
+        return True
+
+    def done(self, board):
+        pass
+
+    def remaining(self):
+        return 0
+
+
+@pytest.fixture(autouse=True)
+def no_side_effects(monkeypatch):
+    monkeypatch.setattr(notice_core, "write_feeds", lambda pending: None)
+    monkeypatch.setattr(notice_core, "collapse_duplicates", lambda bot, pending: list(pending))
+    monkeypatch.setattr(notice_core, "check_selectors", lambda *a: False)
+    monkeypatch.setattr(notice_core, "is_digest_board", lambda key: False)
+
+
+BOARDS = [{"id": "notice", "name": "공지"}, {"id": "event", "name": "행사"}]
+LISTS = {"notice": [12, 11, 10], "event": [7, 6]}
+
+
+def scan(board, last_id):
+    return iter(Notice(i, f"글 {i}", f"link/{i}") for i in LISTS[board["id"]]), {}
+
+
+def run(tmp_path, monkeypatch, enqueued):
+    data_file = tmp_path / "test_data.json"
+    data_file.write_text(json.dumps({"notice": 10, "event": 6}))
+    monkeypatch.setattr(notice_core, "enqueue",
+                        lambda bot, url, label, payloads: enqueued.pop(0) if enqueued else None)
+    pipeline = NoticePipeline("test", str(data_file), None, lambda name, notices: [{"content": name}], [],
+                              FakeBudget())
+    pending = pipeline.run(BOARDS, scan)
+    return pending, json.loads(data_file.read_text())
+
+
+# ===[테스트]===
+def test_enqueue_failure_keeps_stored_id(tmp_path, monkeypatch):
+    # 웹후크 URL 이 없어 outbox 에 못 넣으면 기준 ID 를 올리지 않음 → 다음 실행에 다시 감지
+    pending, saved = run(tmp_path, monkeypatch, [])
+    assert [key for key, _, _ in pending] == ["test:notice", "test:event"]
+    assert saved == {"notice": 10, "event": 6}
+
+
+def test_only_failed_board_keeps_stored_id(tmp_path, monkeypatch):
+    _, saved = run(tmp_path, monkeypatch, ["msg-1"])
+    assert saved == {"notice": 12, "event": 6}
+
+
+def test_feed_gets_newest_first_board_in_chronological_order(tmp_path, monkeypatch):
+    # WITH 처럼 목록 순서(최신 먼저)로 남는 게시판도 피드에는 오래된 글부터 → 발행 시각이 순서대로
+    written = []
+    monkeypatch.setattr(notice_core, "write_feeds", written.extend)
+    monkeypatch.setattr(notice_core, "enqueue", lambda *a: "msg-1")
+    data_file = tmp_path / "test_data.json"
+    data_file.write_text(json.dumps({"notice": 10, "event": "b"}))
+    monkeypatch.setitem(LISTS, "event", ["d", "c", "b"])
+    pipeline = NoticePipeline("test", str(data_file), None, lambda name, notices: [{"content": name}], [],
+                              FakeBudget())
+    pipeline.run([BOARDS[0], dict(BOARDS[1], numeric=False)], scan)
+    assert [(key, [n.id for n in notices]) for key, _, notices in written] == [
+        ("test:notice", [11, 12]), ("test:event", ["c", "d"])]
@@ -0,0 +1,44 @@
+import json
+import os
+
+import pytest
+
+import run_budget
+
+
+@pytest.fixture
+def schedule(tmp_path, monkeypatch):
+    path = tmp_path / "schedule_data.json"
+    path.write_text(json.dumps({"dept": {"deferred": [], "cost": {"notice": 10}}}))
+    monkeypatch.setattr(run_budget, "SCHEDULE_FILE", str(path))
+    return path
+
+
+def run_once(elapsed):
+    # 게시판 1개를 elapsed 초 걸려 확인한 실행
+    budget = run_budget.RunBudget("dept")
+    budget.admit({"id": "notice", "name": "공지"})
+    budget.board_started["notice"] -= elapsed
+    budget.done({"id": "notice", "name": "공지"})
+    return budget.finish()
+
+
+# ===[테스트]===
+def test_small_cost_change_does_not_rewrite_schedule(schedule):
+    before = os.stat(schedule).st_mtime_ns
+    os.utime(schedule, ns=(before - 10 ** 9, before - 10 ** 9))
+    run_once(11.3)
+    assert os.stat(schedule).st_mtime_ns == before - 10 ** 9
+    assert json.loads(schedule.read_text())["dept"]["cost"] == {"notice": 10}
+
+
+def test_large_cost_change_is_saved_in_whole_seconds(schedule):
+    run_once(40)
+    assert json.loads(schedule.read_text())["dept"]["cost"] == {"notice": 19}
+
+
+def test_deferred_change_is_saved(schedule):
+    budget = run_budget.RunBudget("dept", seconds=run_budget.RESERVE)
+    assert not budget.admit({"id": "notice", "name": "공지"})
+    budget.finish()
+    assert json.loads(schedule.read_text())["dept"] == {"deferred": ["notice"], "cost": {"notice": 10}}
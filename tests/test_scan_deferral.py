@@ -0,0 +1,188 @@
+import json
+
+import pytest
+
+import run_budget
+import with_bot
+from notice_core import NoticePipeline, ScanDeferred, diff_notices
+
+
+# ===[가짜 WITH 목록 (셀레니움 없이)]===
+PAGES = {p: [f"p{p}-{i}" for i in range(3)] for p in range(1, 6)}
+
+
+class FakeAnchor:
+    def __init__(self, pid):
+        self.pid = pid
+
+    def get_attribute(self, name):
+        return json.dumps({"encSddpbSeq": self.pid})
+
+
+class FakeItem:
+    def __init__(self, pid):
+        self.pid = pid
+
+    def find_element(self, by, selector):
+        return FakeAnchor(self.pid)
+
+
+class FakeDriver:
+    """lag: global.page() 뒤 이만큼 확인한 다음에야 목록이 바뀜 (그 전에는 이전 목록이 남아 있음)"""
+
+    def __init__(self, lag=0):
+        self.handles = ["main"]
+        self.current_window_handle = "main"
+        self.page = {"main": 1}
+        self.pending = {}
+        self.lag = lag
+        self.opened = 0
+
+    @property
+    def window_handles(self):
+        return list(self.handles)
+
+    @property
+    def switch_to(self):
+        driver = self
+
+        class SwitchTo:
+            def window(self, handle):
+                driver.current_window_handle = handle
+        return SwitchTo()
+
+    def get(self, url):
+        self.page[self.current_window_handle] = 1
+
+    def execute_script(self, script, *args):
+        if script.startswith("window.open"):
+            self.opened += 1
+            handle = f"tab{self.opened}"
+            self.handles.append(handle)
+            self.page[handle] = 1
+        elif script.startswith("global.page"):
+            self.pending[self.current_window_handle] = [int(script[len("global.page("):-2]), self.lag]
+        elif script == with_bot.FIRST_ITEM_JS:
+            self._settle()
+            return json.dumps({"encSddpbSeq": PAGES[self.page[self.current_window_handle]][0]})
+
+    def _settle(self):
+        pending = self.pending.get(self.current_window_handle)
+        if pending:
+            if pending[1] <= 0:
+                self.page[self.current_window_handle] = pending[0]
+                del self.pending[self.current_window_handle]
+            else:
+                pending[1] -= 1
+
+    def close(self):
+        self.handles.remove(self.current_window_handle)
+
+    def find_elements(self, by, selector):
+        return [FakeItem(pid) for pid in PAGES.get(self.page[self.current_window_handle], [])]
+
+
+class FakeBudget:
+    """deny 에 든 페이지는 시간이 모자란 것처럼 미룸"""
+
+    def __init__(self, deny=()):
+        self.deny = set(deny)
+
+    def admit(self, board):
+        return board["id"] not in self.deny
+
+    def done(self, board):
+        pass
+
+    def sleep(self, seconds):
+        pass
+
+    def timeout(self, default):
+        return default
+
+
+class FakeWait:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def until(self, condition):
+        if not callable(condition):
+            return True
+        for _ in range(10):
+            if condition(self.driver):
+                return True
+        raise TimeoutError("조건 미충족")
+
+
+@pytest.fixture(autouse=True)
+def fake_selenium(monkeypatch):
+    monkeypatch.setattr(with_bot, "make_wait", lambda driver, budget, default=20: FakeWait(driver))
+    monkeypatch.setattr(with_bot, "EC", type("EC", (), {"presence_of_element_located": staticmethod(lambda loc: True)}))
+    monkeypatch.setattr(with_bot, "send_simple_error_log", lambda *a: None)
+    monkeypatch.setattr(with_bot, "parse_program",
+                        lambda driver, item, pid, a_tag, cache, hits: with_bot.Notice(pid, pid, "link"))
+    monkeypatch.setattr(with_bot, "PAGE_DEPTH", 5)
+    monkeypatch.setattr(with_bot, "PAGE_TABS", 2)
+
+
+def scan(budget, last_id, lag=0):
+    hits = with_bot.Counter()
+    return with_bot.scan_programs(FakeDriver(lag), budget, last_id, {}, hits), hits
+
+
+# ===[테스트]===
+def test_deferred_page_before_stored_id_raises():
+    notices, _ = scan(FakeBudget(deny={"page4"}), "p4-1")
+    with pytest.raises(ScanDeferred):
+        diff_notices(notices, "p4-1", numeric=False)
+
+
+def test_stored_id_before_deferred_page_is_fine():
+    notices, _ = scan(FakeBudget(deny={"page4"}), "p2-1")
+    new, newest = diff_notices(notices, "p2-1", numeric=False)
+    assert [n.id for n in new] == ["p1-0", "p1-1", "p1-2", "p2-0"]
+    assert newest == "p1-0"
+
+
+def test_pipeline_keeps_state_when_pages_deferred(tmp_path):
+    pipeline = NoticePipeline("with", str(tmp_path / "with_data.json"), None, None, [], FakeBudget())
+    board = with_bot.BOARDS[0]
+    saved_data = {"last_read_id": "p4-1"}
+    pending = []
+
+    changed = pipeline.check(board, lambda b, last_id: scan(FakeBudget(deny={"page4"}), last_id), saved_data, pending)
+
+    assert changed is False
+    assert saved_data == {"last_read_id": "p4-1"}
+    assert pending == []
+
+
+def test_deferred_board_is_must_run_next_time(tmp_path, monkeypatch):
+    schedule = tmp_path / "schedule_data.json"
+    schedule.write_text(json.dumps({"with": {"deferred": ["page2"], "cost": {"page2": 500, "page3": 500}}}))
+    monkeypatch.setattr(run_budget, "SCHEDULE_FILE", str(schedule))
+    budget = run_budget.RunBudget("with", seconds=run_budget.RESERVE + 30)
+
+    assert budget.admit({"id": "page2", "name": "2페이지"})
+    assert not budget.admit({"id": "page3", "name": "3페이지"})
+
+
+def test_slow_page_change_is_not_read_as_end_of_list():
+    # 탭이 늦게 바뀌어도 이전(1페이지) 목록을 읽고 "목록 끝"으로 멈추지 않음
+    notices, _ = scan(FakeBudget(), "p5-0", lag=3)
+    new, _ = diff_notices(notices, "p5-0", numeric=False)
+    assert [n.id for n in new] == [f"p{p}-{i}" for p in range(1, 5) for i in range(3)]
+
+
+def test_page_that_never_changes_keeps_state(tmp_path):
+    # 탭이 끝내 안 바뀌면 이전 목록을 "목록 끝"으로 읽지 않고 실패 → 기준 ID 유지
+    pipeline = NoticePipeline("with", str(tmp_path / "with_data.json"), None, None, [], FakeBudget())
+    saved_data = {"last_read_id": "p4-1"}
+    pending = []
+
+    changed = pipeline.check(with_bot.BOARDS[0], lambda b, last_id: scan(FakeBudget(), last_id, lag=50),
+                             saved_data, pending)
+
+    assert changed is False
+    assert saved_data == {"last_read_id": "p4-1"}
+    assert pending == []
@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from state_store import StateCorruptError, git_merge, load_state, merge_values, save_state, update_state
+
+STATE_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "state_store.py")
+
+
+# ===[병합 규칙]===
+def test_merge_values_max_union_recursive():
+    old = {"notice": 12, "seen": ["a", "b"], "board": {"last": 3, "ids": [1]}, "flag": True, "name": "옛"}
+    new = {"notice": 10, "seen": ["b", "c"], "board": {"last": 5, "ids": [2]}, "flag": False, "name": "새"}
+    assert merge_values(old, new) == {
+        "notice": 12,
+        "seen": ["a", "b", "c"],
+        "board": {"last": 5, "ids": [1, 2]},
+        "flag": False,
+        "name": "새",
+    }
+
+
+def test_save_state_merges_with_disk(tmp_path):
+    path = str(tmp_path / "bot_data.json")
+    save_state(path, {"notice": 20, "event": 5})
+    # 다른 실행이 오래된 값으로 저장해도 디스크의 더 큰 값이 남음
+    assert save_state(path, {"notice": 15, "job": 1}) == {"notice": 20, "event": 5, "job": 1}
+    assert load_state(path) == {"notice": 20, "event": 5, "job": 1}
+
+
+# ===[손상 복구]===
+def test_truncated_file_recovers_from_backup(tmp_path):
+    path = str(tmp_path / "bot_data.json")
+    save_state(path, {"notice": 10})
+    save_state(path, {"notice": 11})       # 첫 저장본이 .bak 로
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"notice": 1')            # 쓰다가 잘린 파일
+    assert load_state(path) == {"notice": 10}
+
+
+def test_corrupt_without_backup_raises(tmp_path):
+    path = tmp_path / "bot_data.json"
+    path.write_text('{"notice": 1')
+    with pytest.raises(StateCorruptError):
+        load_state(str(path))
+
+
+def test_strict_update_keeps_corrupt_copy_and_raises(tmp_path):
+    path = tmp_path / "outbox_data.json"
+    path.write_text('{"messages": [')
+    called = []
+    with pytest.raises(StateCorruptError):
+        update_state(str(path), called.append, strict=True)
+    # 손상본은 그대로 + .bak 로 보관, update 는 호출되지 않음
+    assert called == []
+    assert path.read_text() == '{"messages": ['
+    assert (tmp_path / "outbox_data.json.bak").read_text() == '{"messages": ['
+
+
+def test_non_strict_update_starts_over(tmp_path):
+    path = tmp_path / "schedule_data.json"
+    path.write_text('{"dept": ')
+    update_state(str(path), lambda data: data.update(dept={"deferred": []}))
+    assert json.loads(path.read_text()) == {"dept": {"deferred": []}}
+
+
+# ===[git merge driver]===
+def test_git_merge_writes_merged_state_to_ours(tmp_path):
+    base, ours, theirs = (tmp_path / name for name in ("base", "ours", "theirs"))
+    base.write_text("{}")
+    ours.write_text(json.dumps({"notice": 12, "seen": ["a"]}))
+    theirs.write_text(json.dumps({"notice": 14, "seen": ["b"], "event": 3}))
+    assert git_merge(str(base), str(ours), str(theirs)) == 0
+    assert json.loads(ours.read_text()) == {"notice": 14, "seen": ["b", "a"], "event": 3}
+
+
+def test_merge_driver_exits_1_on_bad_json(tmp_path):
+    base, ours, theirs = (tmp_path / name for name in ("base", "ours", "theirs"))
+    base.write_text("{}")
+    ours.write_text('{"notice": 12}')
+    theirs.write_text("<<<<<<< HEAD")
+    result = subprocess.run([sys.executable, STATE_STORE, "merge", str(base), str(ours), str(theirs)],
+                            capture_output=True, text=True)
+    assert result.returncode == 1
+    # 실패하면 ours 는 건드리지 않음 (git 이 충돌로 남김)
+    assert ours.read_text() == '{"notice": 12}'
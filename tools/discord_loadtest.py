@@ -0,0 +1,264 @@
+"""
+웹후크 전송 부하 테스트 (로컬 가짜 디스코드 서버)
+
+가짜 서버가 레이트 리밋 버킷/Retry-After/느린 응답/5xx를 흉내 내고,
+합성 공지 묶음을 각 봇의 전송 경로(렌더링 → outbox → 백그라운드 전송)로 밀어 넣어 처리량, 지연 백분위,
+유실/중복 건수를 측정한다.
+
+사용법:
+    python tools/discord_loadtest.py --notices 150 --scenario ratelimit
+    python tools/discord_loadtest.py --scenario flaky --bots cse,with
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+MARKER = re.compile(r"LT-\d{6}")
+
+# ===[시나리오]===
+# bucket: (요청 수, 초) 웹후크별 레이트 리밋 / fail: 5xx 비율 / ghost: 처리 후 5xx 응답 비율(중복 유발)
+# slow: 느린 응답 비율 / slow_delay: 지연 범위(초)
+SCENARIOS = {
+    "clean":     {"bucket": None,   "fail": 0.0,  "ghost": 0.0,  "slow": 0.0, "slow_delay": (0, 0)},
+    "ratelimit": {"bucket": (5, 2), "fail": 0.0,  "ghost": 0.0,  "slow": 0.0, "slow_delay": (0, 0)},
+    "flaky":     {"bucket": (5, 2), "fail": 0.1,  "ghost": 0.03, "slow": 0.0, "slow_delay": (0, 0)},
+    "slow":      {"bucket": (5, 2), "fail": 0.0,  "ghost": 0.0,  "slow": 0.2, "slow_delay": (0.5, 2.0)},
+    "chaos":     {"bucket": (5, 2), "fail": 0.1,  "ghost": 0.03, "slow": 0.2, "slow_delay": (0.5, 6.0)},
+}
+
+
+# ===[가짜 디스코드 서버]===
+class FakeDiscord:
+    """웹후크별 버킷을 가진 로컬 디스코드 대역"""
+
+    def __init__(self, scenario, seed=0):
+        self.cfg = SCENARIOS[scenario]
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.buckets = {}       # path → [남은 수, 리셋 시각]
+        self.received = []      # (수신 시각, 마커)
+        self.status = Counter()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def webhook_url(self, name):
+        return f"{self.base_url}/api/webhooks/{abs(hash(name)) % 10 ** 8}/{name}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _take_token(self, path):
+        """버킷 차감, (허용 여부, 남은 수, 리셋까지 초) 반환"""
+        limit = self.cfg["bucket"]
+        if not limit:
+            return True, 1, 0.0
+        count, per = limit
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(path)
+            if not bucket or now >= bucket[1]:
+                bucket = self.buckets[path] = [count, now + per]
+            reset_after = max(bucket[1] - now, 0.0)
+            if bucket[0] <= 0:
+                return False, 0, reset_after
+            bucket[0] -= 1
+            return True, bucket[0], reset_after
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code, body=None, headers=None):
+                data = json.dumps(body or {}).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+                with fake.lock:
+                    fake.status[code] += 1
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                cfg, rnd = fake.cfg, fake.random
+                allowed, remaining, reset_after = fake._take_token(self.path)
+                if not allowed:
+                    self._reply(429, {"message": "You are being rate limited.", "retry_after": round(reset_after, 3), "global": False},
+                                {"Retry-After": f"{reset_after:.3f}"})
+                    return
+                if cfg["slow"] and rnd.random() < cfg["slow"]:
+                    time.sleep(rnd.uniform(*cfg["slow_delay"]))
+                if cfg["fail"] and rnd.random() < cfg["fail"]:
+                    self._reply(rnd.choice([500, 502, 503]), {"message": "internal error"})
+                    return
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    self._reply(400, {"message": "bad json"})
+                    return
+                text = payload.get("content") or ""
+                for embed in payload.get("embeds") or []:
+                    text += embed.get("title", "") + embed.get("description", "")
+                now = time.monotonic()
+                with fake.lock:
+                    fake.received.extend((now, m) for m in MARKER.findall(text))
+                if cfg["ghost"] and rnd.random() < cfg["ghost"]:
+                    # 메시지는 올라갔지만 응답은 실패 → 재시도하면 중복
+                    self._reply(502, {"message": "bad gateway"})
+                    return
+                self._reply(204 if "wait" not in self.path else 200, {},
+                            {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset-After": f"{reset_after:.3f}"})
+
+        return Handler
+
+
+# ===[합성 공지]===
+def make_notices(start, count):
+    return [{
+        "id": 900000 + i,
+        "title": f"[부하테스트] 합성 공지 LT-{i:06d} " + "가" * random.randint(10, 60),
+        "link": f"https://example.invalid/notice?articleNo={900000 + i}",
+        "is_top": i % 17 == 0,
+    } for i in range(start, start + count)]
+
+
+def make_with_items(notices):
+    return [{
+        "id": str(n["id"]), "title": n["title"], "d_day": "D-7", "link": n["link"],
+        "is_multi": False, "sub_items": [], "multi_calc": {},
+        "apply_raw": "2026.10.01 09:00 ~ 2026.10.20 18:00",
+        "oper_raw": "2026.10.21 ~ 2026.10.30", "capacity": "30명",
+    } for n in notices]
+
+
+# ===[봇 전송 경로]===
+def bot_senders(fake):
+    """봇 이름 → 공지 리스트를 outbox 에 넣는 함수 (실제 전송은 봇별 백그라운드 스레드)"""
+    import tempfile
+    import outbox
+    import cse_bot, dorm_bot, library_bot, with_bot
+    # 실제 data/outbox_data.json 은 건드리지 않음
+    outbox.OUTBOX_FILE = os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "outbox_data.json")
+    renders = {
+        "cse": lambda ns: cse_bot.render_batch_alert("부하테스트", ns),
+        "dorm": lambda ns: dorm_bot.render_batch_alert("부하테스트", ns),
+        "library": lambda ns: library_bot.render_message(ns),
+        "with": lambda ns: with_bot.render_batch_messages(make_with_items(ns)),
+    }
+    senders = {}
+    for name, render in renders.items():
+        url = fake.webhook_url(name)
+        outbox.start_delivery(name, url)
+        senders[name] = lambda ns, name=name, url=url, render=render: outbox.enqueue(name, url, "부하테스트", render(ns))
+    return senders
+
+
+def drain(bots, timeout):
+    """outbox 가 빌 때까지 대기 (봇별 전송 스레드 종료)"""
+    import outbox
+    for bot in bots:
+        outbox.finish_delivery(bot, timeout)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(pct / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+def run(args):
+    fake = FakeDiscord(args.scenario, args.seed).start()
+    try:
+        senders = bot_senders(fake)
+        bots = [b.strip() for b in args.bots.split(",") if b.strip()]
+        expected = {}
+        sent_at = {}
+        threads = []
+        start = time.monotonic()
+        offset = 0
+
+        def push(bot, notices):
+            t0 = time.monotonic()
+            for n in notices:
+                sent_at[MARKER.search(n["title"]).group()] = t0
+            try:
+                senders[bot](notices)
+            except Exception as e:
+                print(f"⚠ [{bot}] 전송 경로 예외: {e}")
+
+        for bot in bots:
+            for _ in range(args.batches):
+                notices = make_notices(offset, args.notices)
+                offset += args.notices
+                for n in notices:
+                    expected[MARKER.search(n["title"]).group()] = bot
+                thread = threading.Thread(target=push, args=(bot, notices))
+                threads.append(thread)
+                thread.start()
+                if not args.parallel:
+                    thread.join()
+        for thread in threads:
+            thread.join()
+        drain(bots, args.timeout)
+        elapsed = time.monotonic() - start
+    finally:
+        fake.stop()
+
+    counts = Counter(m for _, m in fake.received)
+    first_seen = {}
+    for t, m in fake.received:
+        first_seen.setdefault(m, t)
+    latencies = [first_seen[m] - sent_at[m] for m in first_seen if m in sent_at]
+    lost = [m for m in expected if m not in counts]
+    duplicated = [m for m, c in counts.items() if c > 1]
+
+    print("\n" + "━" * 40)
+    print(f"📊 부하 테스트 결과 (시나리오: {args.scenario}, 봇: {args.bots}, 묶음 {args.batches} x {args.notices}건)")
+    print(f"- 소요 시간: {elapsed:.2f}초 / 처리량: {len(first_seen) / elapsed if elapsed else 0:.1f}건/초")
+    print(f"- 웹후크 요청: {sum(fake.status.values())}회 (상태 코드 {dict(sorted(fake.status.items()))})")
+    print(f"- 전달 지연: p50 {percentile(latencies, 50):.2f}s / p95 {percentile(latencies, 95):.2f}s / p99 {percentile(latencies, 99):.2f}s")
+    print(f"- 기대 {len(expected)}건 / 수신 {len(first_seen)}건 / 유실 {len(lost)}건 / 중복 {len(duplicated)}건")
+    if lost:
+        by_bot = Counter(expected[m] for m in lost)
+        print(f"  ↳ 유실 봇별: {dict(by_bot)}")
+    # 공용 클라이언트의 연결 재사용 확인
+    import http_client
+    http_client.report("loadtest")
+    return 1 if lost else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="디스코드 웹후크 전송 부하 테스트")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="ratelimit")
+    parser.add_argument("--notices", type=int, default=120, help="묶음 1개당 공지 수")
+    parser.add_argument("--batches", type=int, default=1, help="봇마다 보낼 묶음 수")
+    parser.add_argument("--bots", default="cse,dorm,library,with")
+    parser.add_argument("--parallel", action="store_true", help="묶음을 동시에 전송")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=300, help="outbox 를 비울 때까지 기다릴 최대 시간(초)")
+    sys.exit(run(parser.parse_args()))
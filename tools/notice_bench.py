@@ -0,0 +1,102 @@
+"""
+공지 모델 메모리/처리량 비교 (dict vs Notice)
+
+대량 백필/검색 색인처럼 공지를 한꺼번에 많이 들고 있을 때를 가정해
+공지 1건당 메모리(tracemalloc), 생성 속도, diff_notices 처리량을 비교한다.
+
+사용법:
+    python tools/notice_bench.py --count 200000
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from notice_core import Notice, diff_notices
+
+
+# ===[합성 공지]===
+def make_fields(count):
+    """최신 글부터 (id, 제목, 링크, 고정글 여부) - 문자열은 미리 만들어 두고 객체 크기만 비교"""
+    return [
+        (count - i, f"[학사] 공지 제목 {i}", f"https://example.ac.kr/notice.do?mode=view&articleNo={count - i}", i < 5)
+        for i in range(count)
+    ]
+
+
+def build_dicts(fields):
+    return [{"id": a, "title": t, "link": l, "is_top": top} for a, t, l, top in fields]
+
+
+def build_notices(fields):
+    return [Notice(a, t, l, top) for a, t, l, top in fields]
+
+
+# ===[측정]===
+def measure_memory(build, fields):
+    """만든 리스트가 차지하는 바이트 (문자열 제외, 리스트 포함)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build(fields)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, items
+
+
+def measure_rate(fn, count, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best if best else float("inf")
+
+
+def dict_diff(items, last_id):
+    """Notice 이전 방식 (dict 키로 접근) - 비교용"""
+    new_items = []
+    newest = last_id
+    for item in items:
+        if item["id"] <= last_id:
+            if item["is_top"]:
+                continue
+            break
+        newest = max(newest, item["id"])
+        new_items.append(item)
+    new_items.sort(key=lambda n: n["id"])
+    return new_items, newest
+
+
+def run(count, repeat):
+    fields = make_fields(count)
+    dict_bytes, dicts = measure_memory(build_dicts, fields)
+    notice_bytes, notices = measure_memory(build_notices, fields)
+    # 기준 ID 를 목록 중간에 둬서 절반을 훑게 함
+    last_id = count // 2
+
+    rows = [
+        ("dict", dict_bytes, measure_rate(lambda: build_dicts(fields), count, repeat),
+         measure_rate(lambda: dict_diff(iter(dicts), last_id), count // 2, repeat)),
+        ("Notice", notice_bytes, measure_rate(lambda: build_notices(fields), count, repeat),
+         measure_rate(lambda: diff_notices(iter(notices), last_id), count // 2, repeat)),
+    ]
+
+    print("\n" + "━" * 40)
+    print(f"📊 공지 모델 비교 ({count:,}건, 최고 기록 {repeat}회 중)")
+    for name, used, build_rate, diff_rate in rows:
+        print(f"- {name:6s}: {used / count:6.1f} B/건 ({used / 1024 / 1024:6.1f}MB) / "
+              f"생성 {build_rate:,.0f}건/초 / diff {diff_rate:,.0f}건/초")
+    print(f"- 메모리 절감: {(1 - notice_bytes / dict_bytes) * 100:.0f}%")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공지 모델 메모리/처리량 비교")
+    parser.add_argument("--count", type=int, default=200000, help="공지 수")
+    parser.add_argument("--repeat", type=int, default=3, help="속도 측정 반복 횟수")
+    args = parser.parse_args()
+    run(args.count, args.repeat)